@@ -0,0 +1,21 @@
+"""Memory of each tidy table with default vs compact dtypes.
+
+    python -m benchmarks.bench_dtypes
+"""
+from __future__ import annotations
+import pandas as pd
+from src.config import DATA_PROCESSED
+from src.storage import memory_report, read_tidy
+
+
+def main() -> None:
+    tables = {p.name: read_tidy(p) for p in sorted(DATA_PROCESSED.glob("*_tidy.csv"))}
+    report = memory_report(tables)
+    with pd.option_context("display.width", 120, "display.float_format", "{:.2f}".format):
+        print(report.to_string(index=False))
+    total_before, total_after = report["before_kib"].sum(), report["after_kib"].sum()
+    print(f"total: {total_before:.1f} KiB -> {total_after:.1f} KiB ({total_after / total_before:.0%})")
+
+
+if __name__ == "__main__":
+    main()
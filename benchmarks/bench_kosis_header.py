@@ -0,0 +1,82 @@
+"""Vectorized KOSIS header parse + stack vs the previous per-column loop + melt.
+
+Builds a synthetic KOSIS export with 10k+ value columns in a temp dir:
+
+    python -m benchmarks.bench_kosis_header [n_years] [n_rows]
+"""
+from __future__ import annotations
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.preprocess import SPECS, _kosis_header
+from src.sources import stack_wide
+
+SPEC = SPECS["kosis_prior_convictions"]
+KOSIS_CRIME_COLS = list(SPEC.id_cols)
+
+GROUPS = [("합계", "소계"), ("전과없음", "소계"), ("전과", "소계")] + [("전과", f"{i}범") for i in range(1, 9)] + [("미상", "소계")]
+
+
+def write_synthetic(path: Path, n_years: int, n_rows: int) -> int:
+    years = [str(1000 + i) for i in range(n_years) for _ in GROUPS]
+    top = [g for _ in range(n_years) for g, _ in GROUPS]
+    sub = [d for _ in range(n_years) for _, d in GROUPS]
+    values = np.random.default_rng(0).integers(0, 100_000, (n_rows, len(years)))
+    with open(path, "w", encoding="utf-8") as f:
+        for labels in (years, top, sub):
+            f.write(",".join(KOSIS_CRIME_COLS + labels) + "\n")
+        for i, row in enumerate(values):
+            f.write(",".join([f"대{i % 7}", f"중{i % 31}", f"소{i}"] + row.astype(str).tolist()) + "\n")
+    return len(years)
+
+
+def legacy(path: Path) -> pd.DataFrame:
+    """The loop-and-split implementation this replaced, kept for comparison."""
+    df = pd.read_csv(path, encoding="utf-8", low_memory=False)
+    header1, header2 = df.iloc[0], df.iloc[1]
+    new_cols = {}
+    for c in [c for c in df.columns if c not in KOSIS_CRIME_COLS]:
+        year = re.findall(r"\d{4}", str(c))
+        year = year[0] if year else str(c)
+        top = str(header1[c]).strip().replace("nan", "").strip()
+        sub = str(header2[c]).strip().replace("nan", "").strip()
+        new_cols[c] = "_".join([x for x in [year, top, sub] if x])
+    df = df.rename(columns=new_cols).iloc[2:].copy()
+    df = df[~df["범죄별(1)"].astype(str).str.contains("범죄별", na=False)]
+    long = df.melt(id_vars=KOSIS_CRIME_COLS, var_name="metric", value_name="count")
+    parts = long["metric"].str.split("_", n=2, expand=True)
+    long["year"], long["group"], long["detail"] = parts[0], parts[1].fillna(""), parts[2].fillna("")
+    long["count"] = pd.to_numeric(long["count"], errors="coerce")
+    long = long.dropna(subset=["count"])
+    long["count"] = long["count"].astype(int)
+    long = long.rename(columns=dict(zip(KOSIS_CRIME_COLS, ["crime_lvl1", "crime_lvl2", "crime_lvl3"])))
+    return long[["year", "crime_lvl1", "crime_lvl2", "crime_lvl3", "group", "detail", "count"]]
+
+
+def vectorized(path: Path) -> pd.DataFrame:
+    header = _kosis_header(pd.read_csv(path, encoding="utf-8", nrows=2).drop(columns=KOSIS_CRIME_COLS))
+    return stack_wide(SPEC, pd.read_csv(path, encoding="utf-8", skiprows=[1, 2]), header)
+
+
+def main(n_years: int = 900, n_rows: int = 200) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "kosis_synthetic.csv"
+        n_cols = write_synthetic(path, n_years, n_rows)
+        print(f"synthetic KOSIS: {n_rows} rows x {n_cols} value columns")
+
+        results = {}
+        for name, fn in [("legacy", legacy), ("vectorized", vectorized)]:
+            t0 = time.perf_counter()
+            results[name] = fn(path)
+            print(f"  {name:10} {time.perf_counter() - t0:7.2f}s  {len(results[name])} rows")
+
+    a, b = (r.reset_index(drop=True) for r in (results["legacy"], results["vectorized"]))
+    print("  identical output:", a.astype(str).equals(b.astype(str)))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,57 @@
+"""Reshape cost of the prosecution period table: melt+extract+concat vs the numpy engine.
+
+Replicates the real wide table's rows (default 100x) and times only the
+wide-to-long step, so read/decoding cost is excluded:
+
+    python -m benchmarks.bench_prosecution [scale]
+"""
+from __future__ import annotations
+import sys
+import time
+import pandas as pd
+from src.config import DATA_RAW
+from src.preprocess import SPECS, _prosecution_header
+from src.sources import read_raw_csv, stack_wide
+
+SPEC = SPECS["prosecution_period_type"]
+
+
+def legacy(df: pd.DataFrame) -> pd.DataFrame:
+    """The melt-based implementation this replaced, kept for comparison."""
+    id_col = "범죄분류"
+    long = df.melt(id_vars=[id_col], var_name="metric", value_name="count")
+    parsed = long["metric"].str.extract(r"(?P<recid_type>동종재범|이종재범)_(?P<period>.+)")
+    long = pd.concat([long[[id_col, "count"]], parsed], axis=1)
+    long = long.rename(columns={id_col: "crime"})
+    long["count"] = pd.to_numeric(long["count"], errors="coerce").fillna(0).astype(int)
+    return long[["crime", "recid_type", "period", "count"]]
+
+
+def engine(df: pd.DataFrame) -> pd.DataFrame:
+    return stack_wide(SPEC, df, _prosecution_header(df.drop(columns=list(SPEC.id_cols))))
+
+
+def _best_of(fn, df: pd.DataFrame, repeat: int = 5) -> tuple[float, pd.DataFrame]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(df)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main(scale: int = 100) -> None:
+    raw = sorted(DATA_RAW.glob(SPEC.pattern))[-1]
+    base = read_raw_csv(raw, SPEC.encoding)
+    wide = pd.concat([base] * scale, ignore_index=True)
+    print(f"{raw.name} x{scale}: {len(wide)} rows x {wide.shape[1] - 1} value columns")
+
+    t_old, old = _best_of(legacy, wide)
+    t_new, new = _best_of(engine, wide)
+    print(f"  melt+extract+concat {t_old * 1e3:8.1f} ms")
+    print(f"  numpy engine        {t_new * 1e3:8.1f} ms  ({t_old / t_new:.1f}x)")
+    print("  identical output:", old.reset_index(drop=True).equals(new))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,95 @@
+"""Parse-time NA/number specs vs reading as text and coercing afterwards.
+
+Builds synthetic KOSIS (values with "-" markers) and world-rates ("53%") files
+in a temp dir:
+
+    python -m benchmarks.bench_read_specs [n_rows] [n_cols]
+"""
+from __future__ import annotations
+import dataclasses
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.preprocess import SPECS, _kosis_header
+from src.sources import stack_wide
+
+SPEC = SPECS["kosis_prior_convictions"]
+KOSIS_CRIME_COLS = list(SPEC.id_cols)
+
+
+def write_kosis(path: Path, n_rows: int, n_cols: int) -> None:
+    rng = np.random.default_rng(0)
+    cells = rng.integers(0, 100_000, (n_rows, n_cols)).astype(str)
+    cells[rng.random((n_rows, n_cols)) < 0.1] = "-"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(",".join(KOSIS_CRIME_COLS + ["2023"] * n_cols) + "\n")
+        f.write(",".join(KOSIS_CRIME_COLS + ["전과"] * n_cols) + "\n")
+        f.write(",".join(KOSIS_CRIME_COLS + [f"{i}범" for i in range(n_cols)]) + "\n")
+        for i, row in enumerate(cells):
+            f.write(",".join([f"대{i % 7}", f"중{i % 31}", f"소{i}"] + row.tolist()) + "\n")
+
+
+def write_rates(path: Path, n_rows: int) -> None:
+    rates = np.random.default_rng(0).integers(0, 100, n_rows)
+    pd.DataFrame({"Country": "X", "Rate": [f"{r}%" for r in rates]}).to_csv(path, index=False)
+
+
+def kosis_coerce_after(path: Path) -> pd.DataFrame:
+    header = _kosis_header(pd.read_csv(path, nrows=2).drop(columns=KOSIS_CRIME_COLS))
+    body = pd.read_csv(path, skiprows=[1, 2], low_memory=False)  # "-" leaves object columns
+    return stack_wide(dataclasses.replace(SPEC, na_values=()), body, header)
+
+
+def kosis_parse_spec(path: Path) -> pd.DataFrame:
+    header = _kosis_header(pd.read_csv(path, nrows=2).drop(columns=KOSIS_CRIME_COLS))
+    body = pd.read_csv(path, skiprows=[1, 2], dtype={c: str for c in KOSIS_CRIME_COLS}, **SPEC.parse_options())
+    return stack_wide(SPEC, body, header)
+
+
+def _percent(cell: str) -> float:
+    try:
+        return float(cell.strip().rstrip("%"))
+    except ValueError:
+        return np.nan
+
+
+def rates_converter(path: Path) -> pd.Series:
+    return pd.read_csv(path, dtype={"Country": str}, converters={"Rate": _percent})["Rate"]
+
+
+def rates_vectorized(path: Path) -> pd.Series:
+    """As clean_world_recidivism: read Rate as Arrow text, strip '%' on the whole column, cast."""
+    rate = pd.read_csv(path, dtype={"Country": str, "Rate": "string[pyarrow]"})["Rate"]
+    return rate.str.strip().str.rstrip("%").astype("float64")
+
+
+def _time(fn, path: Path):
+    t0 = time.perf_counter()
+    out = fn(path)
+    return time.perf_counter() - t0, out
+
+
+def main(n_rows: int = 20_000, n_cols: int = 200) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        kosis, rates = Path(tmp) / "kosis.csv", Path(tmp) / "rates.csv"
+        write_kosis(kosis, n_rows, n_cols)
+        write_rates(rates, n_rows * 50)
+
+        print(f"synthetic KOSIS: {n_rows} rows x {n_cols} value columns, 10% '-'")
+        t_old, a = _time(kosis_coerce_after, kosis)
+        t_new, b = _time(kosis_parse_spec, kosis)
+        print(f"  coerce after parse {t_old:7.2f}s")
+        print(f"  na_values at parse {t_new:7.2f}s  identical: {a.equals(b)}")
+
+        print(f"synthetic rates: {n_rows * 50} rows")
+        t_old, a = _time(rates_converter, rates)
+        t_new, b = _time(rates_vectorized, rates)
+        print(f"  per-cell converter       {t_old:7.2f}s")
+        print(f"  str.rstrip + astype      {t_new:7.2f}s  identical: {np.allclose(a, b)}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,82 @@
+"""CLI startup time from ``python -X importtime``, held to a budget.
+
+    python -m benchmarks.bench_startup [--budget-ms 150] [--top 5]
+
+Every case runs ``python -X importtime -m src ...`` in a fresh interpreter
+(best of a few runs) and sums the import times it reports. A case fails,
+and the run exits non-zero, when its imports exceed the budget or when it
+loads one of the heavy libraries that only real work should pull in
+(``--help`` and a dry run never touch a DataFrame or a figure).
+"""
+from __future__ import annotations
+import argparse
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+CASES = [
+    ["--help"],
+    ["preprocess", "--help"],
+    ["tables", "--help"],
+    ["figures", "--help"],
+    ["pipeline", "--help"],
+    ["watch", "--help"],
+    ["fonts", "--help"],
+    ["pipeline", "--dry-run"],
+]
+HEAVY = ("pandas", "numpy", "matplotlib", "pyarrow")
+BUDGET_MS = 150.0
+REPEAT = 3
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def import_times(args: list[str]) -> tuple[float, dict[str, int], int, set[str]]:
+    """(wall seconds, top-level module -> cumulative µs, total µs, every module imported) for one run."""
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src", *args],
+        cwd=ROOT, capture_output=True, text=True, encoding="utf-8",
+    )
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(f"python -m src {' '.join(args)} failed:\n{proc.stderr[-2000:]}")
+    top, total, names = {}, 0, set()
+    for self_us, cumulative_us, indent, name in IMPORT_LINE.findall(proc.stderr):
+        total += int(self_us)
+        names.add(name)
+        if not indent:
+            top[name] = top.get(name, 0) + int(cumulative_us)
+    return wall, top, total, names
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Check CLI import time against a budget.")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="allowed import time per case")
+    parser.add_argument("--top", type=int, default=5, help="slowest top-level imports to list per case")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for case in CASES:
+        label = " ".join(case)
+        wall, top, total, names = min((import_times(case) for _ in range(REPEAT)), key=lambda r: r[2])
+        heavy = sorted(name for name in names if name in HEAVY)
+        ok = total / 1e3 <= args.budget_ms and not heavy
+        print(f"  {label}: imports {total / 1e3:.1f} ms, wall {wall * 1e3:.0f} ms{'' if ok else '  ❌'}")
+        for name, us in sorted(top.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"      {us / 1e3:7.1f} ms  {name}")
+        if heavy:
+            print(f"      loads {', '.join(heavy)}")
+        if not ok:
+            failures.append(label)
+
+    if failures:
+        print(f"❌ {len(failures)} case(s) over the {args.budget_ms:g} ms budget or loading heavy libraries")
+        sys.exit(1)
+    print(f"✅ every case within {args.budget_ms:g} ms of imports")
+
+
+if __name__ == "__main__":
+    main()
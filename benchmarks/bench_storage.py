@@ -0,0 +1,46 @@
+"""Load time and file size of each tidy table: CSV vs Parquet vs memory-mapped .npy.
+
+Run from the repo root after ``python -m src.preprocess --format csv,parquet,mmap``:
+
+    python -m benchmarks.bench_storage
+"""
+from __future__ import annotations
+import time
+import pandas as pd
+from src.config import DATA_PROCESSED
+from src.storage import mmap_dir, parquet_path, read_mmap, read_tidy
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(repeat: int = 20) -> None:
+    # "pq ms" is the raw Parquet read; "mmap ms" opens the .npy maps with labels
+    # as categoricals (read_tidy's default); "tidy ms" is read_tidy with
+    # object_labels=True, which decodes labels back to strings.
+    print(f"{'table':48} {'csv ms':>8} {'pq ms':>8} {'mmap ms':>8} {'tidy ms':>8} "
+          f"{'csv KB':>8} {'pq KB':>8} {'mmap KB':>8}")
+    for csv_path in sorted(DATA_PROCESSED.glob("*_tidy.csv")):
+        pq, mm = parquet_path(csv_path), mmap_dir(csv_path)
+        if not (pq.exists() and mm.exists()):
+            print(f"{csv_path.name:48} (run preprocess --format csv,parquet,mmap)")
+            continue
+        t_csv = _best_of(lambda: pd.read_csv(csv_path, encoding="utf-8-sig"), repeat)
+        t_pq = _best_of(lambda: pd.read_parquet(pq), repeat)
+        t_mm = _best_of(lambda: read_mmap(csv_path), repeat)
+        t_tidy = _best_of(lambda: read_tidy(csv_path, object_labels=True), repeat)
+        mm_kb = sum(p.stat().st_size for p in mm.iterdir()) / 1024
+        print(
+            f"{csv_path.name:48} {t_csv * 1e3:8.2f} {t_pq * 1e3:8.2f} {t_mm * 1e3:8.2f} {t_tidy * 1e3:8.2f} "
+            f"{csv_path.stat().st_size / 1024:8.1f} {pq.stat().st_size / 1024:8.1f} {mm_kb:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
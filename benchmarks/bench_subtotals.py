@@ -0,0 +1,112 @@
+"""Subtotal validation throughput on a synthetic KOSIS-shaped tidy table.
+
+Every 합계/소계 cell is the exact sum of its children; one cell is then nudged
+so the report has something to find. A second case streams a synthetic KOSIS
+export through iter_spec, as preprocess --mem-budget-mb does, with and without
+validation, to show its time and memory cost on multi-million-row inputs:
+
+    python -m benchmarks.bench_subtotals [n_years] [chunk_rows] [stream_scale] [budget_mb]
+"""
+from __future__ import annotations
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src import sources
+from src.preprocess import SPECS, _peak_rss_mb, _reset_peak_rss
+from src.validate import SubtotalValidator
+from .synthetic import write_kosis
+
+SPEC = SPECS["kosis_prior_convictions"]
+N1, N2, N3 = 10, 10, 10  # crime hierarchy fan-out
+COLUMNS = [("합계", "소계"), ("전과없음", "소계"), ("전과", "소계")] + [("전과", f"{i}범") for i in range(1, 9)] + [("미상", "소계")]
+COLUMN_LEAVES = [("전과없음", "소계")] + [("전과", f"{i}범") for i in range(1, 9)] + [("미상", "소계")]
+
+
+def _membership(rows: list[tuple], leaves: list[tuple]) -> np.ndarray:
+    """rows x leaves 0/1 matrix: which leaves each (sub)total row adds up."""
+    r, l = np.array(rows, dtype=object)[:, None, :], np.array(leaves, dtype=object)[None, :, :]
+    return ((r == l) | np.isin(r, ["합계", "소계"])).all(axis=2).astype(float)
+
+
+def synthetic(n_years: int) -> pd.DataFrame:
+    crime_leaves = [(f"대{a}", f"중{a}-{b}", f"소{a}-{b}-{c}") for a in range(N1) for b in range(N2) for c in range(N3)]
+    crimes = [("합계", "소계", "소계")]
+    for a in range(N1):
+        crimes.append((f"대{a}", "소계", "소계"))
+        for b in range(N2):
+            crimes.append((f"대{a}", f"중{a}-{b}", "소계"))
+            crimes.extend((f"대{a}", f"중{a}-{b}", f"소{a}-{b}-{c}") for c in range(N3))
+
+    rows, cols = _membership(crimes, crime_leaves), _membership(COLUMNS, COLUMN_LEAVES)
+    leaves = np.random.default_rng(0).integers(0, 1000, (n_years, len(crime_leaves), len(COLUMN_LEAVES))).astype(float)
+    # Float matmuls run through BLAS and are exact for these magnitudes.
+    values = (rows @ (leaves @ cols.T)).transpose(0, 2, 1).astype(np.int64)  # year, column, crime
+
+    crime = np.array(crimes, dtype=object)
+    column = np.array(COLUMNS, dtype=object)
+    n_crime, n_col = len(crimes), len(COLUMNS)
+    return pd.DataFrame({
+        "year": np.repeat(np.arange(n_years) + 1000, n_col * n_crime),
+        "crime_lvl1": np.tile(crime[:, 0], n_years * n_col),
+        "crime_lvl2": np.tile(crime[:, 1], n_years * n_col),
+        "crime_lvl3": np.tile(crime[:, 2], n_years * n_col),
+        "group": np.tile(np.repeat(column[:, 0], n_crime), n_years),
+        "detail": np.tile(np.repeat(column[:, 1], n_crime), n_years),
+        "count": values.ravel(),
+    })
+
+
+def _run(df: pd.DataFrame, chunk_rows: int | None) -> tuple[float, SubtotalValidator, pd.DataFrame]:
+    t0 = time.perf_counter()
+    validator = SubtotalValidator(SPEC.subtotals, SPEC.value_name)
+    step = chunk_rows or len(df)
+    for start in range(0, len(df), step):
+        validator.update(df.iloc[start:start + step])
+    bad = validator.violations()
+    return time.perf_counter() - t0, validator, bad
+
+
+def _stream(path: Path, budget_mb: float, validate: bool) -> tuple[float, float, int, SubtotalValidator | None]:
+    """(seconds, RSS growth in MB, rows, validator) for one streamed pass over ``path``."""
+    _reset_peak_rss()
+    start_mb = _peak_rss_mb()
+    validator = SubtotalValidator(SPEC.subtotals, SPEC.value_name) if validate else None
+    t0, rows = time.perf_counter(), 0
+    for chunk in sources.iter_spec(SPEC, path, budget_mb):
+        rows += len(chunk)
+        if validator is not None:
+            validator.update(chunk)
+    if validator is not None:
+        validator.violations()
+    return time.perf_counter() - t0, _peak_rss_mb() - start_mb, rows, validator
+
+
+def streamed(scale: float, budget_mb: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "kosis_prior_convictions_2023.csv"
+        write_kosis(path, scale, np.random.default_rng(0))
+        sources.UTF8_CACHE = Path(tmp) / "_utf8_cache"  # keep the repo's mirrors untouched
+        _stream(path, budget_mb, False)  # build the UTF-8 mirror outside the timings
+        for label, validate in [("no validation", False), ("validated", True)]:
+            seconds, grown_mb, rows, validator = _stream(path, budget_mb, validate)
+            checked = f"  {validator.checked()} groups" if validator is not None else ""
+            print(f"  {label:20} {seconds:6.2f}s  +{grown_mb:.0f} MB RSS  {rows} rows{checked}")
+
+
+def main(n_years: int = 150, chunk_rows: int = 250_000, stream_scale: int = 3000, budget_mb: int = 16) -> None:
+    df = synthetic(n_years)
+    df.loc[len(df) // 2, "count"] += 1
+    print(f"synthetic KOSIS tidy table: {len(df)} rows")
+    for label, chunk in [("whole table", None), (f"{chunk_rows}-row chunks", chunk_rows)]:
+        seconds, validator, bad = _run(df, chunk)
+        print(f"  {label:20} {seconds:6.2f}s  {len(df) / seconds / 1e6:5.1f}M rows/s  "
+              f"{validator.checked()} groups, {len(bad)} mismatches")
+    print(f"synthetic KOSIS export at scale {stream_scale:g}, streamed with a {budget_mb:g} MB budget")
+    streamed(stream_scale, budget_mb)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,186 @@
+"""One benchmark per cleaner, summary-table block and figure, with stored baselines.
+
+Runs every ``clean_*`` on the raw files, then every make_tables block and
+``fig_*`` on the resulting tidy tables, for the real data and for a synthetic
+set (benchmarks.synthetic). Time is the best of several runs; peak memory
+comes from a separate tracemalloc run.
+
+    python -m benchmarks.suite                      # compare with benchmarks/baseline.json
+    python -m benchmarks.suite --update-baseline    # record new baselines
+    python -m benchmarks.suite --only fig_ --scale 1000
+
+Exits non-zero when a case is slower or larger than ``--threshold`` times its
+baseline. Baselines are machine specific; re-record them on the machine that
+runs the check.
+"""
+from __future__ import annotations
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pandas as pd  # noqa: E402
+from src import make_tables, preprocess, sources, visualize  # noqa: E402
+from src.config import DATA_RAW  # noqa: E402
+from src.storage import read_tidy, write_tidy  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+
+BASELINE = Path(__file__).with_name("baseline.json")
+# Differences below these floors are noise, whatever the ratio.
+MIN_SECONDS = 0.005
+MIN_MB = 1.0
+TARGET_SECONDS = 0.5  # repeat each case until about this much time is spent
+
+CLEANERS: dict[str, Callable[[Path], pd.DataFrame]] = {
+    "prosecution_period_type": preprocess.clean_prosecution_period_type,
+    "kosis_prior_convictions": preprocess.clean_kosis_prior_convictions,
+    "police_education": preprocess.clean_police_education,
+    "police_prior_record": preprocess.clean_police_prior_record,
+    "world_recidivism": preprocess.clean_world_recidivism,
+    "enara_3yr": preprocess.clean_enara_3yr_excel,
+}
+
+
+def measure(fn: Callable[[], object], max_repeat: int = 20) -> tuple[float, float]:
+    """(best seconds, peak MiB) for one zero-argument call."""
+    t0 = time.perf_counter()
+    fn()
+    best = time.perf_counter() - t0
+    for _ in range(min(max_repeat, int(TARGET_SECONDS / max(best, 1e-6))) - 1):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak / 2**20
+
+
+def run_dataset(label: str, raw_dir: Path, work: Path, only: str | None) -> dict[str, dict[str, float]]:
+    results = {}
+    # UTF-8 mirrors go to the temp dir: synthetic raws share the real files'
+    # stems and would otherwise replace the repo's mirrors in data/processed.
+    sources.UTF8_CACHE = work / f"{label}_utf8_cache"
+
+    def case(name: str, fn: Callable[[], object]) -> None:
+        if only and only not in name:
+            return
+        seconds, peak_mb = measure(fn)
+        results[f"{label}/{name}"] = {"seconds": round(seconds, 6), "peak_mb": round(peak_mb, 3)}
+        print(f"  {label}/{name}: {seconds * 1e3:.1f} ms, peak {peak_mb:.1f} MB", flush=True)
+
+    # Cleaners run on the vintage the tables and figures read (the newest one
+    # for sources nothing reads); their outputs become the tidy tables the
+    # later cases use, written exactly as preprocess writes them.
+    consumed = {tidy for _, tidy in make_tables.TABLES.values()} | set(visualize.TIDY_FILES.values())
+    tidy_dir = work / f"{label}_tidy"
+    tidy_dir.mkdir(parents=True, exist_ok=True)
+    tidy_paths = {}
+    for spec in preprocess.SOURCES:
+        raws = sorted(raw_dir.glob(spec.pattern))
+        read = [raw for raw in raws if f"{raw.stem}_tidy.csv" in consumed]
+        if not raws:
+            print(f"  {label}: no raw file for {spec.pattern}")
+            continue
+        raw, clean = (read or raws)[-1], CLEANERS[spec.name]
+        case(clean.__name__, lambda: clean(raw))
+        for vintage in read:
+            out = tidy_dir / f"{vintage.stem}_tidy.csv"
+            write_tidy(preprocess._with_year(clean(vintage), preprocess._vintage_year(vintage.name)), out, "csv")
+            tidy_paths[out.name] = out
+
+    for out_name, (build, tidy_name) in make_tables.TABLES.items():
+        if tidy_name not in tidy_paths:
+            print(f"  {label}/{build.__name__}: skipped, no raw file for {tidy_name}")
+            continue
+        df = read_tidy(tidy_paths[tidy_name])
+        case(build.__name__, lambda: build(df))
+
+    visualize._set_style()
+    for out_name, (fig, table, kwargs) in visualize.FIGURES.items():
+        tidy_name = visualize.TIDY_FILES[table]
+        if tidy_name not in tidy_paths:
+            print(f"  {label}/{fig.__name__}: skipped, no raw file for {tidy_name}")
+            continue
+        df = read_tidy(tidy_paths[tidy_name])
+        case(fig.__name__, lambda: fig(df, work / out_name, **kwargs))
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+    expected: set[str],
+) -> list[str]:
+    """Cases whose time or peak memory regressed past ``threshold`` x baseline,
+    plus ``expected`` baseline cases that did not run at all."""
+    failures = []
+    print(f"\n{'case':56} {'ms':>9} {'base':>9} {'MB':>7} {'base':>7}")
+    for name in sorted(expected - results.keys()):
+        print(f"{name:56} {'-':>9} {baseline[name]['seconds'] * 1e3:9.1f} {'-':>7} {baseline[name]['peak_mb']:7.1f}  ❌ did not run")
+        failures.append(name)
+    for name, now in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:56} {now['seconds'] * 1e3:9.1f} {'-':>9} {now['peak_mb']:7.1f} {'-':>7}  (new)")
+            continue
+        slow = now["seconds"] > base["seconds"] * threshold and now["seconds"] - base["seconds"] > MIN_SECONDS
+        big = now["peak_mb"] > base["peak_mb"] * threshold and now["peak_mb"] - base["peak_mb"] > MIN_MB
+        flag = "  ❌ slower" * slow + "  ❌ more memory" * big
+        print(f"{name:56} {now['seconds'] * 1e3:9.1f} {base['seconds'] * 1e3:9.1f} "
+              f"{now['peak_mb']:7.1f} {base['peak_mb']:7.1f}{flag}")
+        if slow or big:
+            failures.append(name)
+    return failures
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark every cleaner, table block and figure against baselines.")
+    parser.add_argument("--scale", type=float, default=100, help="synthetic data scale (0 = real data only)")
+    parser.add_argument("--only", default=None, help="run only cases whose name contains this text")
+    parser.add_argument("--threshold", type=float, default=1.5, help="fail above this multiple of the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="write this run's results as the baseline")
+    args = parser.parse_args(argv)
+
+    results = {}
+    labels = ["real"]
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        results |= run_dataset("real", DATA_RAW, work, args.only)
+        if args.scale:
+            labels.append(f"synthetic-{args.scale:g}x")
+            results |= run_dataset(labels[-1], generate(work / "raw", args.scale)[0].parent, work, args.only)
+
+    stored = json.loads(BASELINE.read_text(encoding="utf-8")) if BASELINE.exists() else {"cases": {}}
+    if args.update_baseline:
+        stored["cases"] |= results
+        stored["env"] = {"python": platform.python_version(), "pandas": pd.__version__, "machine": platform.machine()}
+        BASELINE.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"✅ baseline updated: {BASELINE}")
+        return
+
+    # Every baseline case of the datasets and filter this run covers must have run.
+    expected = {name for name in stored["cases"]
+                if name.split("/")[0] in labels and (not args.only or args.only in name.split("/", 1)[1])}
+    failures = compare(results, stored["cases"], args.threshold, expected)
+    if failures:
+        print(f"\n❌ {len(failures)} regression(s) or missing case(s) against the baseline (threshold {args.threshold}x)")
+        sys.exit(1)
+    print(f"\n✅ no regressions past {args.threshold}x baseline")
+
+
+if __name__ == "__main__":
+    main()
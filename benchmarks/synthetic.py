@@ -0,0 +1,191 @@
+"""Synthetic raw exports, structurally faithful to data/raw, at any scale factor.
+
+Writes one file per source under the real file names, so preprocess can run on
+the output directory as DATA_RAW:
+
+    python -m benchmarks.synthetic OUT_DIR [--scale 100] [--seed 0]
+
+Scale multiplies the data rows of every source (1 = roughly the real sizes).
+Headers, encodings and quirks are kept: cp949 for the Korean CSVs, the three
+KOSIS header rows with consistent 합계/소계 rows and "-" for zero, percent
+strings in the world rates, and the e-나라 sheet with its preamble, text
+cells ("24,356") and trailing notes.
+"""
+from __future__ import annotations
+import argparse
+import math
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+PERIODS = ["1개월이내", "3개월이내", "6개월이내", "1년이내", "2년이내", "3년이내", "3년초과"]
+EDUCATION = (
+    ["불취학"]
+    + [f"{school}({state})" for school in ("초등학교", "중학교", "고등학교", "대학(4년미만)", "대학(4년이상)", "대학원")
+       for state in ("재중", "중퇴", "졸업")]
+    + ["기타", "미상"]
+)
+PRIOR_RECORD = ["없음"] + [f"전과({i}범)" for i in range(1, 9)] + ["전과(9범이상)", "미상"]
+KOSIS_COLUMNS = [("합계", "소계"), ("전과없음", "소계"), ("전과", "소계")] + \
+    [("전과", f"{i}범") for i in range(1, 9)] + [("전과", "9범이상"), ("미상", "소계")]
+KOSIS_LEAVES = [c for c in KOSIS_COLUMNS if c not in (("합계", "소계"), ("전과", "소계"))]
+POLICE_MAJOR = ["강력범죄", "절도범죄", "폭력범죄", "지능범죄", "풍속범죄", "특별경제범죄", "마약범죄", "보건범죄", "환경범죄", "교통범죄"]
+COUNTRIES = ["France", "United States", "New Zealand", "Israel", "South Korea", "Australia", "Austria", "Canada", "Denmark"]
+ENARA_METRICS = ["재복역기간1년이내", "재복역기간2년이내", "재복역기간3년이내", "대상자"]
+ENARA_MAX_YEARS = 100  # year labels must stay in 1900-2099
+
+
+def _counts(rng: np.random.Generator, shape: tuple[int, ...], high: int = 5000) -> np.ndarray:
+    # Heavy-tailed like real counts: many small cells, a few large ones.
+    return np.floor(rng.pareto(1.5, shape) * high / 10).astype(np.int64)
+
+
+def _labels(prefix: str, n: int) -> list[str]:
+    return [f"{prefix}{i}" for i in range(n)]
+
+
+def write_prosecution(path: Path, scale: float, rng: np.random.Generator) -> None:
+    n = max(1, round(160 * scale))
+    cols = [f"{kind}_{p}" for kind in ("동종재범", "이종재범") for p in PERIODS]
+    df = pd.DataFrame(_counts(rng, (n, len(cols))), columns=cols)
+    df.insert(0, "범죄분류", _labels("범죄", n))
+    df.to_csv(path, index=False, encoding="cp949")
+
+
+def _write_police(path: Path, labels: list[str], scale: float, rng: np.random.Generator) -> None:
+    n = max(1, round(28 * scale))
+    df = pd.DataFrame(_counts(rng, (n, len(labels))), columns=labels)
+    df.insert(0, "범죄중분류", [f"중분류{i}" for i in range(n)])
+    df.insert(0, "범죄대분류", [POLICE_MAJOR[i % len(POLICE_MAJOR)] for i in range(n)])
+    df.to_csv(path, index=False, encoding="cp949")
+
+
+def write_police_education(path: Path, scale: float, rng: np.random.Generator) -> None:
+    _write_police(path, EDUCATION, scale, rng)
+
+
+def write_police_prior_record(path: Path, scale: float, rng: np.random.Generator) -> None:
+    _write_police(path, PRIOR_RECORD, scale, rng)
+
+
+def write_kosis(path: Path, scale: float, rng: np.random.Generator, year: int = 2023) -> None:
+    """Crime hierarchy 합계 > 형법범/특별법범 > groups > leaves, with every subtotal
+    row and column the exact sum of its parts."""
+    n_groups = max(1, round(12 * scale))
+    per_group = rng.integers(2, 13, n_groups)  # ~170 data rows at scale 1
+    leaves = _counts(rng, (int(per_group.sum()), len(KOSIS_LEAVES)))
+    leaves[rng.random(leaves.shape) < 0.2] = 0
+
+    rows, values = [], []
+    top = ["형법범" if g < (n_groups + 1) // 2 else "특별법범" for g in range(n_groups)]
+    bounds = np.concatenate([[0], np.cumsum(per_group)])
+    rows.append(("합계", "소계", "소계"))
+    values.append(leaves.sum(axis=0))
+    for lvl1 in dict.fromkeys(top):
+        groups = [g for g in range(n_groups) if top[g] == lvl1]
+        rows.append((lvl1, "소계", "소계"))
+        values.append(leaves[bounds[groups[0]]:bounds[groups[-1] + 1]].sum(axis=0))
+        for g in groups:
+            block = leaves[bounds[g]:bounds[g + 1]]
+            rows.append((lvl1, f"범죄군{g}", "소계"))
+            values.append(block.sum(axis=0))
+            rows.extend((lvl1, f"범죄군{g}", f"죄명{g}-{i}") for i in range(len(block)))
+            values.extend(block)
+
+    leaf_part = np.array(values)
+    prior = leaf_part[:, 1:10].sum(axis=1)
+    cells = np.column_stack([leaf_part.sum(axis=1), leaf_part[:, 0], prior, leaf_part[:, 1:]]).astype(str)
+    cells[cells == "0"] = "-"
+
+    ids = ["범죄별(1)", "범죄별(2)", "범죄별(3)"]
+    with open(path, "w", encoding="cp949", newline="") as f:
+        f.write(",".join([f'"{ids[0]}"', *ids[1:]] + [str(year)] * len(KOSIS_COLUMNS)) + "\n")
+        f.write(",".join([f'"{ids[0]}"', *ids[1:]] + [g for g, _ in KOSIS_COLUMNS]) + "\n")
+        f.write(",".join([f'"{ids[0]}"', *ids[1:]] + [d for _, d in KOSIS_COLUMNS]) + "\n")
+        for (l1, l2, l3), row in zip(rows, cells):
+            f.write(",".join([f'"{l1}"', l2, l3, *row]) + "\n")
+
+
+def write_world(path: Path, scale: float, rng: np.random.Generator) -> None:
+    n = max(1, round(88 * scale))
+    follow = rng.integers(1, 10, n)
+    months = rng.random(n) < 0.05
+    start = rng.integers(1990, 2020, n)
+    pd.DataFrame({
+        "Country": [COUNTRIES[i] if i < len(COUNTRIES) else f"Country {i}" for i in rng.integers(0, len(COUNTRIES) * 2, n)],
+        "Follow-Up": [f"{m * 6} months" if is_m else f"{y} year{'s' if y > 1 else ''}"
+                      for y, m, is_m in zip(follow, rng.integers(1, 6, n), months)],
+        "Rate": [f"{r}%" for r in rng.integers(5, 80, n)],
+        "Type": np.where(rng.random(n) < 0.5, "Reimprisonment", "Reconviction"),
+        "Duration": [f"{s}-{(s + 1) % 100:02d}" if s % 2 else str(s) for s in start],
+    }).to_csv(path, index=False, encoding="utf-8")
+
+
+def write_enara(path: Path, scale: float, rng: np.random.Generator) -> None:
+    """Years grow with scale up to ENARA_MAX_YEARS, then metric blocks repeat."""
+    from openpyxl import Workbook
+
+    n_years = min(ENARA_MAX_YEARS, max(5, round(5 * scale)))
+    n_blocks = max(1, math.ceil(5 * scale / n_years))
+    years = [str(2024 - n_years + i) for i in range(n_years)]
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("출소자 3년 이내 재복역률(e-나라지표)")
+    ws.append(["『출소자 3년 이내 재복역률』"])
+    ws.append([])
+    ws.append([])
+    ws.append(["※그래프"])
+    for _ in range(21):
+        ws.append([])
+    ws.append(["※통계표"])
+    ws.append(["통계표명:", "출소자 3년 이내 재복역률"])
+    ws.append(["단위:", "%, 명"])
+    ws.append([""] + years)
+    for b in range(n_blocks):
+        suffix = f"({b})" if b else ""
+        rates = np.sort(rng.uniform(3, 30, (3, n_years)), axis=0)
+        for metric, row in zip(ENARA_METRICS, rates):
+            ws.append([metric + suffix] + [f"{v:.1f}" for v in row])
+        ws.append(["대상자" + suffix] + [f"{v:,}" for v in rng.integers(20_000, 35_000, n_years)])
+    ws.append(["출처:", "법무부 교정본부(내부 행정통계)"])
+    ws.append([])
+    ws.append(["※의미분석"])
+    ws.append(["지표설명", "■ 지표개념\n\n    출소자 재복역률이란?"])
+    wb.save(path)
+
+
+# Real file name -> writer.
+WRITERS = {
+    "prosecution_reoffend_period_type_2017.csv": write_prosecution,
+    "kosis_prior_convictions_2023.csv": write_kosis,
+    "police_education_2020.csv": write_police_education,
+    "police_prior_record_2020.csv": write_police_prior_record,
+    "world_recidivism_rates.csv": write_world,
+    "e_nara_3yr_reimprisonment.xlsx": write_enara,
+}
+
+
+def generate(out_dir: Path, scale: float = 1.0, seed: int = 0) -> list[Path]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    paths = []
+    for name, write in WRITERS.items():
+        write(out_dir / name, scale, rng)
+        paths.append(out_dir / name)
+    return paths
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Write synthetic raw exports for every source.")
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--scale", type=float, default=1.0, help="data-row multiplier (e.g. 1, 100, 10000)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for path in generate(args.out_dir, args.scale, args.seed):
+        print(f"  {path.name}: {path.stat().st_size / 2**20:.1f} MB")
+    print("✅ synthetic raw data saved to:", args.out_dir)
+
+
+if __name__ == "__main__":
+    main()
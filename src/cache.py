@@ -0,0 +1,148 @@
+from __future__ import annotations
+import codecs
+import dataclasses
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+from typing import Callable
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _called_names(code) -> set[str]:
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _called_names(const)
+    return names
+
+
+def source_sha256(func: Callable) -> str:
+    """Hash of a function's (or class's) source plus every helper function and class
+    it reaches in the same package (e.g. ``src.*``), followed across modules, so
+    edits to a cleaner, its helpers or the shared engine invalidate its outputs."""
+    package = func.__module__.split(".")[0]
+    h = hashlib.sha256()
+    seen: set[Callable] = set()
+    stack = [func]
+    while stack:
+        f = stack.pop()
+        if f in seen:
+            continue
+        seen.add(f)
+        h.update(inspect.getsource(f).encode("utf-8"))
+        if inspect.isclass(f):
+            # The class source covers its methods; follow what they reference.
+            methods = [m for m in vars(f).values() if inspect.isfunction(m)]
+            names = set().union(*(_called_names(m.__code__) for m in methods))
+            scope = methods[0].__globals__ if methods else {}
+        else:
+            f = inspect.unwrap(f)  # decorated helpers, e.g. @contextmanager
+            names, scope = _called_names(f.__code__), f.__globals__
+        for name in sorted(names, reverse=True):
+            g = scope.get(name)
+            if (inspect.isfunction(g) or inspect.isclass(g)) and g.__module__.split(".")[0] == package:
+                stack.append(g)
+    return h.hexdigest()
+
+
+# Encodings seen in data/raw, tried in order. Strict UTF-8 almost never
+# decodes cp949 bytes by accident, so it goes first.
+RAW_ENCODINGS = ("utf-8-sig", "cp949")
+DETECT_BYTES = 1 << 20  # prefix read to guess the encoding
+TRANSCODE_CHUNK = 1 << 20
+
+
+def detect_encoding(prefix: bytes) -> str:
+    """First of RAW_ENCODINGS that decodes ``prefix`` (which may end mid-character)."""
+    for enc in RAW_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(enc)().decode(prefix, final=False)
+        except UnicodeDecodeError:
+            continue
+        return enc
+    raise ValueError(f"Raw file is not in any of {RAW_ENCODINGS}")
+
+
+def _transcode(src: Path, dst: Path, encoding: str) -> None:
+    """Stream ``src`` into ``dst`` as UTF-8, one chunk in memory at a time."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    with open(src, "rb") as fin, open(dst, "w", encoding="utf-8", newline="") as fout:
+        for chunk in iter(lambda: fin.read(TRANSCODE_CHUNK), b""):
+            fout.write(decoder.decode(chunk))
+        fout.write(decoder.decode(b"", final=True))
+
+
+def _is_mirror_of(name: str, path: Path) -> bool:
+    """``<stem>.<sha256><suffix>``: a mirror of any version of ``path``."""
+    digest = name[len(path.stem) + 1:len(name) - len(path.suffix)]
+    return name.startswith(f"{path.stem}.") and name.endswith(path.suffix) and len(digest) == 64
+
+
+def utf8_mirror(path: Path, cache_dir: Path, encoding: str | None = None, sha256: str | None = None) -> Path:
+    """UTF-8 copy of a raw text export, transcoded once per content hash.
+
+    Later reads of unchanged bytes hit the existing mirror and can use
+    pandas' native UTF-8 parser instead of a Python-level codec. The file is
+    transcoded in chunks, so memory stays flat whatever its size; the encoding
+    is guessed from a prefix unless given. Mirrors of earlier versions of the
+    same raw file are removed. ``sha256`` skips re-hashing a file whose digest
+    the caller already has.
+    """
+    mirror = cache_dir / f"{path.stem}.{sha256 or file_sha256(path)}{path.suffix}"
+    if mirror.exists():
+        return mirror
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    if encoding is None:
+        with open(path, "rb") as f:
+            encoding = detect_encoding(f.read(DETECT_BYTES))
+        # A prefix can be valid UTF-8 by accident (plain ASCII); later encodings are the fallback.
+        candidates = RAW_ENCODINGS[RAW_ENCODINGS.index(encoding):]
+    else:
+        candidates = (encoding,)
+    tmp = mirror.with_name(f"{mirror.name}.{os.getpid()}.tmp")
+    for i, enc in enumerate(candidates):
+        try:
+            _transcode(path, tmp, enc)
+            break
+        except UnicodeDecodeError:
+            tmp.unlink(missing_ok=True)
+            if i == len(candidates) - 1:
+                raise
+    tmp.replace(mirror)
+
+    for old in cache_dir.iterdir():
+        if old != mirror and _is_mirror_of(old.name, path):
+            old.unlink(missing_ok=True)
+    return mirror
+
+
+def spec_sha256(spec) -> str:
+    """Hash of a dataclass spec: plain fields by repr, function fields by source."""
+    h = hashlib.sha256()
+    for f in dataclasses.fields(spec):
+        value = getattr(spec, f.name)
+        h.update(f.name.encode("utf-8"))
+        h.update((source_sha256(value) if inspect.isfunction(value) else repr(value)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def load_manifest(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_manifest(path: Path, manifest: dict[str, dict]) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
@@ -0,0 +1,48 @@
+"""One entry point for every stage: ``python -m src <command> [options]``.
+
+    python -m src preprocess --jobs 4
+    python -m src pipeline --dry-run
+    python -m src figures --help
+
+Only the chosen command's module is imported, and those modules load pandas,
+numpy and matplotlib lazily (src.lazy), so ``--help`` and runs with nothing
+to rebuild start in a fraction of the time a full import takes. The modules
+still run on their own as ``python -m src.<module>``.
+"""
+from __future__ import annotations
+import importlib
+import sys
+
+# Command -> (module under src, summary).
+COMMANDS: dict[str, tuple[str, str]] = {
+    "preprocess": ("preprocess", "clean data/raw sources into tidy tables under data/processed"),
+    "tables": ("make_tables", "build the H1-H4 summary tables under outputs/"),
+    "figures": ("visualize", "render the figures under outputs/figures/"),
+    "pipeline": ("pipeline", "rebuild only what changed: raw -> tidy -> tables and figures"),
+    "watch": ("watch", "watch data/raw and rebuild the outputs affected by each change"),
+    "fonts": ("fonts", "build matplotlib's font list and show the Korean figure font"),
+}
+
+
+def usage() -> str:
+    width = max(map(len, COMMANDS))
+    lines = ["usage: python -m src <command> [options]", "", "commands:"]
+    lines += [f"  {name:{width}}  {summary}" for name, (_, summary) in COMMANDS.items()]
+    lines += ["", "Run 'python -m src <command> --help' for a command's options."]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(usage(), file=sys.stderr)
+        raise SystemExit(f"\nunknown command: {command}")
+
+    module = importlib.import_module(f".{COMMANDS[command][0]}", __package__)
+    # argparse takes the program name for usage lines from argv[0].
+    sys.argv[0] = f"python -m src {command}"
+    module.main(rest)
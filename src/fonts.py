@@ -0,0 +1,95 @@
+"""Korean font for the figures, and a cheap stamp of everything that decides it.
+
+matplotlib keeps the list of installed fonts in its own cache
+(``fontlist-v*.json``), built by scanning every system font the first time the
+font manager loads (can take seconds on a fresh container) and reused until
+that file is removed; fonts installed later are not seen before that. Picking
+the first installed font of PREFERRED_FONTS from the loaded list is then
+instant, so there is no second cache here:
+
+    python -m src fonts [--refresh]    # build (or rebuild) matplotlib's font list
+
+font_stamp() describes the inputs of that choice (matplotlib version, font
+list file, matplotlibrc) from file metadata alone, without importing
+matplotlib, so render caches can tell when the figure font may have changed.
+"""
+from __future__ import annotations
+import argparse
+import importlib.metadata
+import os
+import sys
+import time
+from pathlib import Path
+from .lazy import lazy_import
+
+matplotlib = lazy_import("matplotlib")
+font_manager = lazy_import("matplotlib.font_manager")
+
+PREFERRED_FONTS = ("Malgun Gothic", "AppleGothic", "NanumGothic", "Noto Sans CJK KR", "Noto Sans KR")
+FALLBACK_FONT = "DejaVu Sans"
+
+
+def resolve_font(preferred: tuple[str, ...] = PREFERRED_FONTS) -> tuple[str, str | None]:
+    """(family, font file) of the first installed font in ``preferred``; (DejaVu Sans, None) if none is."""
+    installed = {f.name: f.fname for f in font_manager.fontManager.ttflist}
+    for name in preferred:
+        if name in installed:
+            return name, installed[name]
+    return FALLBACK_FONT, None
+
+
+def _mpl_dir(xdg_env: str, xdg_default: str) -> Path:
+    """matplotlib's cache or config directory, located the way matplotlib does it."""
+    if os.environ.get("MPLCONFIGDIR"):
+        return Path(os.environ["MPLCONFIGDIR"])
+    if sys.platform.startswith(("linux", "freebsd")):
+        return Path(os.environ.get(xdg_env) or Path.home() / xdg_default) / "matplotlib"
+    if sys.platform == "win32" and not (Path.home() / ".matplotlib").is_dir() and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "matplotlib"
+    return Path.home() / ".matplotlib"
+
+
+def _file_stamp(path: Path) -> tuple[str, int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return str(path), st.st_size, st.st_mtime_ns
+
+
+def font_stamp() -> dict:
+    """What the figure font and style depend on besides our code, from file metadata only."""
+    try:
+        version = importlib.metadata.version("matplotlib")
+    except importlib.metadata.PackageNotFoundError:
+        version = None
+    fontlists = sorted(_mpl_dir("XDG_CACHE_HOME", ".cache").glob("fontlist-v*.json"))
+    rc_files = [Path(os.environ["MATPLOTLIBRC"])] if os.environ.get("MATPLOTLIBRC") else []
+    rc_files += [Path.cwd() / "matplotlibrc", _mpl_dir("XDG_CONFIG_HOME", ".config") / "matplotlibrc"]
+    return {
+        "matplotlib": version,
+        "preferred": list(PREFERRED_FONTS),
+        "fontlist": [_file_stamp(p) for p in fontlists],
+        "matplotlibrc": next((s for s in map(_file_stamp, rc_files) if s is not None), None),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Build matplotlib's font list and show the figure font.")
+    parser.add_argument("--refresh", action="store_true", help="rescan the installed fonts (after installing one)")
+    args = parser.parse_args(argv)
+
+    if args.refresh:
+        # matplotlib rebuilds its font list whenever the cached file is missing.
+        for path in Path(matplotlib.get_cachedir()).glob("fontlist-v*.json"):
+            path.unlink()
+    t0 = time.perf_counter()
+    n_fonts = len(font_manager.fontManager.ttflist)  # loads matplotlib's font list, scanning on first use
+    print(f"  matplotlib font list: {n_fonts} fonts in {time.perf_counter() - t0:.2f}s")
+    family, file = resolve_font()
+    print(f"  font: {family} ({file or 'bundled with matplotlib'})")
+    print("✅ font list saved under:", matplotlib.get_cachedir())
+
+
+if __name__ == "__main__":
+    main()
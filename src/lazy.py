@@ -0,0 +1,23 @@
+"""Deferred imports of the heavy libraries (pandas, numpy, matplotlib).
+
+    pd = lazy_import("pandas")
+
+binds a placeholder module that imports the real one on first attribute
+access, so commands that never touch a DataFrame or a figure (``--help``,
+``pipeline --dry-run``, an up-to-date incremental run) do not pay for them.
+"""
+from __future__ import annotations
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self.__name__)
+        # Later lookups find the real attributes directly, without __getattr__.
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    return LazyModule(name)
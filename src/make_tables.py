@@ -1,50 +1,99 @@
 from __future__ import annotations
-import pandas as pd
+import argparse
+from pathlib import Path
+from typing import Callable
 from .config import DATA_PROCESSED, OUTPUTS
+from .lazy import lazy_import
+from .profiling import add_profile_arguments, profile_options, profiled
+from .storage import read_tidy
+from .tracing import add_trace_argument, span, trace_to
+
+pd = lazy_import("pandas")
 
-def main() -> None:
-    OUTPUTS.mkdir(parents=True, exist_ok=True)
 
-    # H2: distribution of recidivism period (동종/이종 합계)
-    df_p = pd.read_csv(DATA_PROCESSED / "prosecution_reoffend_period_type_2017_tidy.csv", encoding="utf-8-sig")
-    h2 = (
-        df_p.groupby(["recid_type", "period"], as_index=False)["count"].sum()
+# H2: distribution of recidivism period (동종/이종 합계)
+def h2_period_distribution(df_p: pd.DataFrame) -> pd.DataFrame:
+    return (
+        df_p.groupby(["recid_type", "period"], as_index=False, observed=True)["count"].sum()
           .sort_values(["recid_type", "count"], ascending=[True, False])
     )
-    h2.to_csv(OUTPUTS / "H2_period_distribution.csv", index=False, encoding="utf-8-sig")
 
-    # H1(대체): 2023 전과(없음 vs 있음) 비중 (KOSIS)
-    df_k = pd.read_csv(DATA_PROCESSED / "kosis_prior_convictions_2023_tidy.csv", encoding="utf-8-sig")
+
+# H1(대체): 2023 전과(없음 vs 있음) 비중 (KOSIS)
+def h1_prior_share(df_k: pd.DataFrame) -> pd.DataFrame:
     # use only overall total row: (합계/소계/소계) & group=='전과없음' or '전과'
     total = df_k[(df_k["crime_lvl1"]=="합계") & (df_k["crime_lvl2"]=="소계") & (df_k["crime_lvl3"]=="소계")]
-    h1 = total[total["group"].isin(["전과없음","전과"])].groupby(["year","group"], as_index=False)["count"].sum()
+    h1 = total[total["group"].isin(["전과없음","전과"])].groupby(["year","group"], as_index=False, observed=True)["count"].sum()
     # share
     denom = h1.groupby("year")["count"].transform("sum")
     h1["share"] = h1["count"]/denom
-    h1.to_csv(OUTPUTS / "H1_prior_share_2023.csv", index=False, encoding="utf-8-sig")
-
-    # H3: education distribution aggregated to <=고졸 vs 대졸+
-    df_e = pd.read_csv(DATA_PROCESSED / "police_education_2020_tidy.csv", encoding="utf-8-sig")
-    def edu_bucket(x: str) -> str:
-        if x.startswith("대학") or x.startswith("대학원"):
-            return "대학이상"
-        if x.startswith("고등학교") or x.startswith("중학교") or x.startswith("초등학교") or x=="불취학":
-            return "고졸이하"
-        return "기타/미상"
-    df_e["bucket"] = df_e["education"].map(edu_bucket)
-    h3 = df_e.groupby(["bucket"], as_index=False)["count"].sum()
+    return h1
+
+
+# H3: education distribution aggregated to <=고졸 vs 대졸+
+def _edu_bucket(x: str) -> str:
+    if x.startswith("대학") or x.startswith("대학원"):
+        return "대학이상"
+    if x.startswith("고등학교") or x.startswith("중학교") or x.startswith("초등학교") or x=="불취학":
+        return "고졸이하"
+    return "기타/미상"
+
+
+def h3_education_bucket(df_e: pd.DataFrame) -> pd.DataFrame:
+    df_e = df_e.copy()
+    df_e["bucket"] = df_e["education"].map(_edu_bucket)
+    h3 = df_e.groupby(["bucket"], as_index=False, observed=True)["count"].sum()
     h3["share"] = h3["count"]/h3["count"].sum()
-    h3.to_csv(OUTPUTS / "H3_education_bucket_share_2020.csv", index=False, encoding="utf-8-sig")
+    return h3
+
+
+# H4: Country comparison (1y & 5y, Reimprisonment 우선)
+def h4_country(df_w: pd.DataFrame) -> pd.DataFrame:
+    return df_w[df_w["followup_years"].isin([1.0, 5.0])].copy()
 
-    # H4: Country comparison (1y & 5y, Reimprisonment 우선)
-    df_w = pd.read_csv(DATA_PROCESSED / "world_recidivism_rates_tidy.csv", encoding="utf-8-sig")
-    h4 = df_w[df_w["followup_years"].isin([1.0, 5.0])].copy()
-    h4.to_csv(OUTPUTS / "H4_country_1y_5y.csv", index=False, encoding="utf-8-sig")
 
-    # Domestic trend: e-nara 3yr reimprisonment
-    df_n = pd.read_csv(DATA_PROCESSED / "e_nara_3yr_reimprisonment_tidy.csv", encoding="utf-8-sig")
-    trend = df_n[df_n["metric"].astype(str).str.contains("재복역기간3년이내")]
-    trend.to_csv(OUTPUTS / "domestic_3yr_reimprisonment_rate.csv", index=False, encoding="utf-8-sig")
+# Domestic trend: e-nara 3yr reimprisonment
+def domestic_trend(df_n: pd.DataFrame) -> pd.DataFrame:
+    return df_n[df_n["metric"].astype(str).str.contains("재복역기간3년이내")]
+
+
+# Output file -> (builder, tidy table it reads).
+TABLES: dict[str, tuple[Callable[[pd.DataFrame], pd.DataFrame], str]] = {
+    "H2_period_distribution.csv": (h2_period_distribution, "prosecution_reoffend_period_type_2017_tidy.csv"),
+    "H1_prior_share_2023.csv": (h1_prior_share, "kosis_prior_convictions_2023_tidy.csv"),
+    "H3_education_bucket_share_2020.csv": (h3_education_bucket, "police_education_2020_tidy.csv"),
+    "H4_country_1y_5y.csv": (h4_country, "world_recidivism_rates_tidy.csv"),
+    "domestic_3yr_reimprisonment_rate.csv": (domestic_trend, "e_nara_3yr_reimprisonment_tidy.csv"),
+}
+
+
+def build_table(out_name: str, compact: bool = False) -> Path:
+    """Build one summary table from its tidy input and write it under outputs/."""
+    func, tidy_name = TABLES[out_name]
+    out = OUTPUTS / out_name
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with span(out_name, cat="table"):
+        df = read_tidy(DATA_PROCESSED / tidy_name, compact=compact)
+        with span("aggregate", func=func.__name__, rows_in=len(df)) as s:
+            table = func(df)
+            s["rows"] = len(table)
+        with span("write", table=out_name, rows=len(table)):
+            table.to_csv(out, index=False, encoding="utf-8-sig")
+    return out
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Build the H1-H4 summary tables under outputs/.")
+    parser.add_argument("--compact", action="store_true", help="load tidy tables with compact dtypes (categoricals, small uints)")
+    add_profile_arguments(parser)
+    add_trace_argument(parser, "make_tables")
+    args = parser.parse_args(argv)
+
+    OUTPUTS.mkdir(parents=True, exist_ok=True)
+    profile = profile_options(args, "make_tables")
+    with trace_to(args.trace, "make_tables"):
+        for out_name in TABLES:
+            profiled(profile, out_name, build_table, out_name, args.compact)
 
     print("✅ outputs saved to:", OUTPUTS)
 
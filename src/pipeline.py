@@ -0,0 +1,231 @@
+"""Make-style runner for raw file -> tidy table -> summary table / figure.
+
+Each output file is a node. A node re-runs only when its output is missing or
+its key changed: the content hashes of its inputs plus a hash of the code that
+builds it. Nodes whose inputs are ready run in parallel with ``--jobs``.
+
+    python -m src.pipeline [--jobs N] [--dry-run]
+"""
+from __future__ import annotations
+import argparse
+import hashlib
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
+from functools import partial
+from pathlib import Path
+from typing import Callable
+from . import make_tables, visualize
+from .cache import file_sha256, load_manifest, save_manifest, source_sha256
+from .config import DATA_PROCESSED, OUTPUTS
+from .preprocess import MANIFEST, _build, _build_key, discover_tasks
+from .profiling import ProfileOptions, add_profile_arguments, profile_options, profiled
+from .storage import default_format, mmap_dir, parquet_path, parse_formats, tidy_exists
+from .tracing import add_trace_argument, trace_to
+
+PIPELINE_MANIFEST = DATA_PROCESSED / "_pipeline.json"
+
+
+@dataclass(frozen=True)
+class Node:
+    name: str  # output file name, unique across the graph
+    stage: str  # "tidy", "table" or "figure"
+    deps: tuple[str, ...]  # upstream node names
+    key: Callable[[], dict]  # evaluated once every dep is up to date
+    exists: Callable[[], bool]
+    task: tuple  # (function, *args), run in a worker process
+    manifest: Path
+
+
+def _tidy_sha256(csv_path: Path) -> str:
+    """Content hash over every representation of a tidy table (CSV, Parquet, mmap)."""
+    files = [csv_path, parquet_path(csv_path)]
+    if mmap_dir(csv_path).is_dir():
+        files += sorted(mmap_dir(csv_path).iterdir())
+    h = hashlib.sha256()
+    for path in files:
+        if path.exists():
+            h.update(path.name.encode("utf-8"))
+            h.update(file_sha256(path).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _derived_key(tidy_names: list[str], code: str, compact: bool) -> dict:
+    return {
+        "inputs": {name: _tidy_sha256(DATA_PROCESSED / name) for name in tidy_names},
+        "code": code,
+        "compact": compact,
+    }
+
+
+def _figure_key(tidy_names: list[str], code: str, compact: bool) -> dict:
+    # The same style key visualize's own render cache uses (code, font, matplotlib),
+    # evaluated when the node is checked so a newly installed font is noticed.
+    return {**_derived_key(tidy_names, code, compact), "style": visualize.style_sha256()}
+
+
+def build_graph(fmt: str, mem_budget_mb: float | None = None, compact: bool = False) -> dict[str, Node]:
+    nodes: dict[str, Node] = {}
+    for source, raw_name, out_name in discover_tasks():
+        # Shares preprocess's manifest, so either entry point reuses the other's work.
+        nodes[out_name] = Node(
+            name=out_name,
+            stage="tidy",
+            deps=(),
+            key=partial(_build_key, source, raw_name, fmt, mem_budget_mb),
+            exists=partial(tidy_exists, DATA_PROCESSED / out_name, fmt),
+            task=(_build, source, raw_name, out_name, fmt, mem_budget_mb),
+            manifest=MANIFEST,
+        )
+
+    for out_name, (func, tidy_name) in make_tables.TABLES.items():
+        nodes[out_name] = Node(
+            name=out_name,
+            stage="table",
+            deps=tuple(d for d in (tidy_name,) if d in nodes),
+            key=partial(_derived_key, [tidy_name], source_sha256(func), compact),
+            exists=(OUTPUTS / out_name).exists,
+            task=(make_tables.build_table, out_name, compact),
+            manifest=PIPELINE_MANIFEST,
+        )
+
+    for out_name, (func, table, kwargs) in visualize.FIGURES.items():
+        tidy_name = visualize.TIDY_FILES[table]
+        code = hashlib.sha256((source_sha256(func) + repr(sorted(kwargs.items()))).encode("utf-8")).hexdigest()
+        nodes[out_name] = Node(
+            name=out_name,
+            stage="figure",
+            deps=tuple(d for d in (tidy_name,) if d in nodes),
+            key=partial(_figure_key, [tidy_name], code, compact),
+            exists=(OUTPUTS / "figures" / out_name).exists,
+            task=(visualize.render_figure, out_name, compact),
+            manifest=PIPELINE_MANIFEST,
+        )
+    return nodes
+
+
+def downstream(nodes: dict[str, Node], roots: set[str]) -> dict[str, Node]:
+    """The subgraph of ``roots`` and every node that depends on them, in graph order."""
+    keep = set(roots)
+    for name, node in nodes.items():  # build_graph adds nodes after their deps
+        if keep.intersection(node.deps):
+            keep.add(name)
+    return {name: replace(node, deps=tuple(d for d in node.deps if d in keep))
+            for name, node in nodes.items() if name in keep}
+
+
+def _timed(func: Callable, *args) -> float:
+    t0 = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - t0
+
+
+def run(
+    nodes: dict[str, Node],
+    jobs: int = 1,
+    force: bool = False,
+    dry_run: bool = False,
+    profile: ProfileOptions | None = None,
+) -> dict[str, str]:
+    """Run the stale part of the graph; returns each node's outcome
+    ("ran", "up to date", "would run", "failed" or "skipped")."""
+    manifests = {m: ({} if force else load_manifest(m)) for m in {n.manifest for n in nodes.values()}}
+    waiting = {name: set(node.deps) for name, node in nodes.items()}
+    dependents: dict[str, list[str]] = {name: [] for name in nodes}
+    for name, node in nodes.items():
+        for dep in node.deps:
+            dependents[dep].append(name)
+
+    status: dict[str, str] = {}
+    running: dict[Future, tuple[str, dict]] = {}
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 and not dry_run else None
+
+    def finish(name: str, outcome: str) -> list[str]:
+        status[name] = outcome
+        ready = []
+        for child in dependents[name]:
+            if outcome in ("failed", "skipped"):
+                if child not in status:
+                    ready += finish(child, "skipped")
+                continue
+            waiting[child].discard(name)
+            if not waiting[child] and child not in status:
+                ready.append(child)
+        return ready
+
+    def start(name: str) -> list[str]:
+        node = nodes[name]
+        upstream_pending = any(status.get(d) == "would run" for d in node.deps)
+        key = None if upstream_pending else node.key()
+        if key is not None and manifests[node.manifest].get(name) == key and node.exists():
+            print(f"  [{node.stage}] {name}: up to date")
+            return finish(name, "up to date")
+        if dry_run:
+            print(f"  [{node.stage}] {name}: would run")
+            return finish(name, "would run")
+        task = (profiled, profile, name, *node.task)
+        if pool is not None:
+            running[pool.submit(_timed, *task)] = (name, key)
+            return []
+        return complete(name, key, lambda: _timed(*task))
+
+    def complete(name: str, key: dict, result: Callable[[], float]) -> list[str]:
+        node = nodes[name]
+        try:
+            elapsed = result()
+        except Exception as e:  # report and keep building the rest of the graph
+            print(f"  [{node.stage}] {name}: ❌ {type(e).__name__}: {e}")
+            return finish(name, "failed")
+        manifest = manifests[node.manifest]
+        manifest[name] = key
+        save_manifest(node.manifest, manifest)
+        print(f"  [{node.stage}] {name}: {elapsed:.2f}s")
+        return finish(name, "ran")
+
+    try:
+        ready = [name for name, deps in waiting.items() if not deps]
+        while ready or running:
+            while ready:
+                ready += start(ready.pop(0))
+            if running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name, key = running.pop(fut)
+                    ready += complete(name, key, fut.result)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return status
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Rebuild only what changed: raw -> tidy -> tables and figures.")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes for independent nodes (1 = serial)")
+    parser.add_argument("--force", action="store_true", help="rebuild every node, ignoring the manifests")
+    parser.add_argument("--dry-run", action="store_true", help="list the nodes that would run without running them")
+    parser.add_argument("--format", default=default_format(), help="tidy table formats, as in src.preprocess")
+    parser.add_argument("--mem-budget-mb", type=float, default=None, help="stream CSV sources, as in src.preprocess")
+    parser.add_argument("--compact", action="store_true", help="load tidy tables with compact dtypes")
+    add_profile_arguments(parser)
+    add_trace_argument(parser, "pipeline")
+    args = parser.parse_args(argv)
+    try:
+        parse_formats(args.format)
+    except (ValueError, RuntimeError) as e:
+        parser.error(str(e))
+
+    DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    nodes = build_graph(args.format, args.mem_budget_mb, args.compact)
+    with trace_to(args.trace, "pipeline"):
+        status = run(nodes, args.jobs, args.force, args.dry_run, profile_options(args, "pipeline"))
+
+    counts = {s: list(status.values()).count(s) for s in dict.fromkeys(status.values())}
+    print(f"  total: {time.perf_counter() - t0:.2f}s ({', '.join(f'{s} {n}' for s, n in counts.items())})")
+    if counts.get("failed"):
+        raise SystemExit(1)
+    print("✅ pipeline complete")
+
+
+if __name__ == "__main__":
+    main()
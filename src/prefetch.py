@@ -0,0 +1,63 @@
+"""Background reads of raw inputs, so slow (network) storage overlaps with cleaning."""
+from __future__ import annotations
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from .cache import file_sha256
+from .tracing import span
+
+
+class RawPrefetcher:
+    """Reads and hashes raw files on a thread pool, in the order they will be built.
+
+    Reading a file to hash it also pulls it into the OS page cache, so the
+    cleaner that opens it next reads from memory instead of the mount. Only
+    the digest is kept, so memory does not grow with file size.
+
+    ``read_s`` is the time the threads spent reading and ``wait_s`` the time
+    callers blocked on ``sha256``; the difference is I/O hidden behind work.
+    """
+
+    def __init__(self, paths: list[Path], workers: int = 2) -> None:
+        self.read_s = 0.0
+        self.wait_s = 0.0
+        self.bytes = 0
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="prefetch")
+        self._futures: dict[Path, Future] = {}
+        for path in paths:
+            if path not in self._futures:
+                self._futures[path] = self._pool.submit(self._read, path)
+
+    @staticmethod
+    def _read(path: Path) -> tuple[str, float, int]:
+        t0 = time.perf_counter()
+        with span("prefetch", file=path.name) as s:
+            digest = file_sha256(path)
+            s["bytes"] = size = path.stat().st_size
+        return digest, time.perf_counter() - t0, size
+
+    def sha256(self, path: Path) -> str:
+        """Digest of ``path``, waiting for its read only if it has not finished yet."""
+        fut = self._futures.get(path)
+        if fut is None:
+            fut = self._futures[path] = self._pool.submit(self._read, path)
+        t0 = time.perf_counter()
+        digest, read_s, size = fut.result()
+        self.wait_s += time.perf_counter() - t0
+        self.read_s += read_s
+        self.bytes += size
+        return digest
+
+    def summary(self) -> str:
+        hidden = max(0.0, self.read_s - self.wait_s)
+        return (f"raw I/O: {self.bytes / 2**20:.1f} MB read in {self.read_s:.2f}s, "
+                f"waited {self.wait_s:.2f}s ({hidden:.2f}s hidden)")
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "RawPrefetcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
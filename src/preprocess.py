@@ -1,158 +1,451 @@
 from __future__ import annotations
+import argparse
+import hashlib
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-import pandas as pd
+from .cache import file_sha256, load_manifest, save_manifest, source_sha256, spec_sha256
 from .config import DATA_RAW, DATA_PROCESSED
+from .lazy import lazy_import
+from .prefetch import RawPrefetcher
+from .profiling import add_profile_arguments, profile_options, profiled
+from .sources import SourceSpec, iter_spec, read_raw_csv, run_spec
+from .storage import FORMATS, HAS_PARQUET, TidyWriter, default_format, parse_formats, tidy_exists, write_tidy
+from .tracing import add_trace_argument, span, trace_to
+from .validate import SubtotalValidator
 
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
 
-def clean_prosecution_period_type(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path, encoding="cp949")
-    id_col = "범죄분류"
-    value_cols = [c for c in df.columns if c != id_col]
-
-    long = df.melt(id_vars=[id_col], value_vars=value_cols, var_name="metric", value_name="count")
-    parsed = long["metric"].str.extract(r"(?P<recid_type>동종재범|이종재범)_(?P<period>.+)")
-    long = pd.concat([long[[id_col, "count"]], parsed], axis=1)
-
-    long = long.rename(columns={id_col: "crime"})
-    long["count"] = pd.to_numeric(long["count"], errors="coerce").fillna(0).astype(int)
-    return long[["crime", "recid_type", "period", "count"]]
-
-
-def clean_kosis_prior_convictions(path: Path) -> pd.DataFrame:
-    """KOSIS style CSV: first 2 rows are multi-headers for year columns."""
-    df = pd.read_csv(path, encoding="cp949")
-    header1 = df.iloc[0]
-    header2 = df.iloc[1]
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
-    crime_cols = ["범죄별(1)", "범죄별(2)", "범죄별(3)"]
-    year_cols = [c for c in df.columns if c not in crime_cols]
+MANIFEST = DATA_PROCESSED / "_manifest.json"
+VINTAGE = re.compile(r"_((?:19|20)\d{2})$")
+YEAR_CELL = re.compile(r"((?:19|20)\d{2})(?:\.0)?$")
+SUBTOTAL_REPORT_ROWS = 10
 
-    new_cols = {}
-    for c in year_cols:
-        year = re.findall(r"\d{4}", str(c))
-        year = year[0] if year else str(c)
 
-        top = str(header1[c]).strip().replace("nan", "").strip()
-        sub = str(header2[c]).strip().replace("nan", "").strip()
+def _labels_as(name: str, head: pd.DataFrame) -> pd.Index:
+    return pd.Index(head.columns.astype(str), name=name)
 
-        name = "_".join([x for x in [year, top, sub] if x])
-        new_cols[c] = name
 
-    df = df.rename(columns=new_cols).iloc[2:].copy()
-    df = df[~df["범죄별(1)"].astype(str).str.contains("범죄별", na=False)]
+def _prosecution_header(head: pd.DataFrame) -> pd.MultiIndex:
+    """"동종재범_1개월이내" -> (recid_type, period)."""
+    parsed = head.columns.astype(str).str.extract(r"(?P<recid_type>동종재범|이종재범)_(?P<period>.+)")
+    return pd.MultiIndex.from_frame(parsed)
 
-    value_cols = [c for c in df.columns if c not in crime_cols]
-    long = df.melt(id_vars=crime_cols, value_vars=value_cols, var_name="metric", value_name="count")
 
-    parts = long["metric"].str.split("_", n=2, expand=True)
-    long["year"] = parts[0]
-    long["group"] = parts[1].fillna("")
-    long["detail"] = parts[2].fillna("")
+def _kosis_header(head: pd.DataFrame) -> pd.MultiIndex:
+    """(year, group, detail) for every value column, from the column labels and the two header rows."""
+    labels = head.columns.astype(str)
+    year = labels.str.extract(r"(\d{4})", expand=False)
+    year = year.where(year.notna(), labels)
 
-    long["count"] = pd.to_numeric(long["count"], errors="coerce")
-    long = long.dropna(subset=["count"])
-    long["count"] = long["count"].astype(int)
+    top = head.iloc[0].fillna("").astype(str).str.strip().to_numpy()
+    sub = head.iloc[1].fillna("").astype(str).str.strip().to_numpy()
+    # A column with no top-level label is grouped under its sub label.
+    group = np.where(top != "", top, sub)
+    detail = np.where(top != "", sub, "")
+    return pd.MultiIndex.from_arrays([year, group, detail], names=["year", "group", "detail"])
 
-    long = long.rename(
-        columns={
-            "범죄별(1)": "crime_lvl1",
-            "범죄별(2)": "crime_lvl2",
-            "범죄별(3)": "crime_lvl3",
-        }
-    )
-    return long[["year", "crime_lvl1", "crime_lvl2", "crime_lvl3", "group", "detail", "count"]]
-
-
-def clean_police_education(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path, encoding="cp949")
-    id_cols = ["범죄대분류", "범죄중분류"]
-    value_cols = [c for c in df.columns if c not in id_cols]
 
-    long = df.melt(id_vars=id_cols, value_vars=value_cols, var_name="education", value_name="count")
-    long["count"] = pd.to_numeric(long["count"], errors="coerce").fillna(0).astype(int)
+def _education_header(head: pd.DataFrame) -> pd.Index:
+    return _labels_as("education", head)
 
-    long = long.rename(columns={"범죄대분류": "crime_major", "범죄중분류": "crime_minor"})
-    return long[["crime_major", "crime_minor", "education", "count"]]
-
-
-def clean_police_prior_record(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path, encoding="cp949")
-    id_cols = ["범죄대분류", "범죄중분류"]
-    value_cols = [c for c in df.columns if c not in id_cols]
 
-    long = df.melt(id_vars=id_cols, value_vars=value_cols, var_name="prior_record", value_name="count")
-    long["count"] = pd.to_numeric(long["count"], errors="coerce").fillna(0).astype(int)
+def _prior_record_header(head: pd.DataFrame) -> pd.Index:
+    return _labels_as("prior_record", head)
 
-    long = long.rename(columns={"범죄대분류": "crime_major", "범죄중분류": "crime_minor"})
-    return long[["crime_major", "crime_minor", "prior_record", "count"]]
 
+def _year_header(head: pd.DataFrame) -> pd.Index:
+    return _labels_as("year", head)
 
-def clean_world_recidivism(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path, encoding="utf-8-sig")
-    df["rate_pct"] = pd.to_numeric(df["Rate"].astype(str).str.replace("%", ""), errors="coerce")
 
-    df["followup_years"] = pd.to_numeric(df["Follow-Up"].astype(str).str.extract(r"(\d+\.?\d*)")[0], errors="coerce")
-    is_month = df["Follow-Up"].astype(str).str.contains("month", case=False, na=False)
-    df.loc[is_month, "followup_years"] = df.loc[is_month, "followup_years"] / 12.0
+def clean_world_recidivism(path: Path, sha256: str | None = None) -> pd.DataFrame:
+    df = read_raw_csv(
+        path,
+        sha256=sha256,
+        # Arrow strings keep the '%' strip and the float cast below in C++.
+        dtype={"Country": str, "Follow-Up": str, "Type": str, "Duration": str,
+               "Rate": "string[pyarrow]" if HAS_PARQUET else str},
+    )
+    df = df.rename(columns={"Rate": "rate_pct"})
+    with span("coerce", source="world_recidivism", rows=len(df)):
+        # '53%' -> 53.0 on the whole column; unreadable cells -> NaN.
+        text = df["rate_pct"].str.strip().str.rstrip("%")
+        try:
+            rate = text.astype("float64").to_numpy()
+        except ValueError:  # some cell is not a number
+            rate = pd.to_numeric(text, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        df["rate_pct"] = rate
+        if np.isfinite(rate).all() and (rate == np.round(rate)).all():
+            df["rate_pct"] = rate.astype(int)  # whole percents stay integers, as in the raw file
+
+        df["followup_years"] = pd.to_numeric(df["Follow-Up"].str.extract(r"(\d+\.?\d*)")[0], errors="coerce")
+        is_month = df["Follow-Up"].str.contains("month", case=False, na=False)
+        df.loc[is_month, "followup_years"] = df.loc[is_month, "followup_years"] / 12.0
 
     return df.rename(
         columns={"Country": "country", "Type": "type", "Duration": "period"}
     )[["country", "followup_years", "rate_pct", "type", "period"]]
 
 
-def clean_enara_3yr_excel(path: Path) -> pd.DataFrame:
-    raw = pd.read_excel(path)
-
-    header_row = None
-    for i, row in raw.iterrows():
-        joined = " ".join([str(x) for x in row.values if pd.notna(x)])
-        if "2019" in joined and "2020" in joined:
-            header_row = i
-            break
-    if header_row is None:
-        raise ValueError("Could not find the year-header row in the Excel sheet.")
-
-    header = raw.iloc[header_row].tolist()
-    df = raw.iloc[header_row + 1 :].copy()
-    df.columns = header
-    df = df.rename(columns={df.columns[0]: "metric"})
-    df = df[df["metric"].notna()]
-    df = df[~df["metric"].astype(str).str.contains("출처", na=False)]
-
-    year_cols = [c for c in df.columns if c != "metric" and str(c) != "nan"]
-    long = df.melt(id_vars=["metric"], value_vars=year_cols, var_name="year", value_name="value")
-
-    long["value"] = (
-        long["value"].astype(str).str.replace(",", "", regex=False)
-    )
-    long["value"] = pd.to_numeric(long["value"], errors="coerce")
-    long = long.dropna(subset=["value"])
-    return long[["metric", "year", "value"]]
+def _year_label(value) -> str | None:
+    """'2019', 2019 and 2019.0 -> '2019'; anything else -> None."""
+    if value is None:
+        return None
+    m = YEAR_CELL.match(str(value).strip())
+    return m.group(1) if m else None
+
+
+def _is_year_header(row: tuple) -> bool:
+    """A header row carries at least two year-like cells (any years, e.g. 2005, 2006, ...)."""
+    return sum(1 for v in row if _year_label(v) is not None) >= 2
+
+
+def _read_excel_year_block(path: Path) -> tuple[list[str], list[tuple]]:
+    """Stream the first sheet until the year-header row, then read only the data block below it.
+
+    The block ends at the first blank row or the "출처" (source) line, so the
+    notes that follow the table are never parsed.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        ws.reset_dimensions()  # exported sheets often carry a bogus <dimension>
+        rows = ws.iter_rows(values_only=True)
+
+        header = next((row for row in rows if _is_year_header(row)), None)
+        if header is None:
+            raise ValueError("Could not find the year-header row in the Excel sheet.")
+
+        block = []
+        for row in rows:
+            first = row[0] if row else None
+            if first is None or not str(first).strip() or "출처" in str(first):
+                break
+            block.append(row)
+    finally:
+        wb.close()
+
+    return [_year_label(v) for v in header], block
+
+
+def _excel_number(value, thousands: str | None, na_values: frozenset[str]) -> float:
+    """A value cell as a float: numbers pass through, text like '24,356' is parsed."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip() if value is not None else ""
+    if not text or text in na_values:
+        return np.nan
+    if thousands:
+        text = text.replace(thousands, "")
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+def _read_enara_wide(path: Path, thousands: str | None = None, na_values: list[str] = ()) -> pd.DataFrame:
+    """The e-나라 data block as a wide frame: ``metric`` plus one float column per year."""
+    header, block = _read_excel_year_block(path)  # header[i] is a year label or None
+
+    year_idx = [i for i in range(1, len(header)) if header[i] is not None]
+    na = frozenset(na_values)
+    values = np.array(
+        [[_excel_number(r[i] if i < len(r) else None, thousands, na) for i in year_idx] for r in block],
+        dtype=float,
+    ).reshape(len(block), len(year_idx))
+    df = pd.DataFrame(values, columns=[header[i] for i in year_idx])
+    df.insert(0, "metric", [r[0] if r else None for r in block])
+    return df
+
+
+# One spec per raw source. Year-stamped sources match every yearly vintage
+# in data/raw; each file becomes one year partition ``<stem>_tidy.csv``.
+SOURCES: list[SourceSpec] = [
+    SourceSpec(
+        name="prosecution_period_type",
+        pattern="prosecution_reoffend_period_type_[0-9][0-9][0-9][0-9].csv",
+        id_cols={"범죄분류": "crime"},
+        parse_header=_prosecution_header,
+    ),
+    SourceSpec(
+        name="kosis_prior_convictions",
+        pattern="kosis_prior_convictions_[0-9][0-9][0-9][0-9].csv",
+        id_cols={"범죄별(1)": "crime_lvl1", "범죄별(2)": "crime_lvl2", "범죄별(3)": "crime_lvl3"},
+        header_rows=2,
+        parse_header=_kosis_header,
+        na_values=("-",),
+        missing="drop",
+        columns=("year", "crime_lvl1", "crime_lvl2", "crime_lvl3", "group", "detail", "count"),
+        subtotals=(("crime_lvl1", "crime_lvl2", "crime_lvl3"), ("group", "detail")),
+    ),
+    SourceSpec(
+        name="police_education",
+        pattern="police_education_[0-9][0-9][0-9][0-9].csv",
+        id_cols={"범죄대분류": "crime_major", "범죄중분류": "crime_minor"},
+        parse_header=_education_header,
+    ),
+    SourceSpec(
+        name="police_prior_record",
+        pattern="police_prior_record_[0-9][0-9][0-9][0-9].csv",
+        id_cols={"범죄대분류": "crime_major", "범죄중분류": "crime_minor"},
+        parse_header=_prior_record_header,
+    ),
+    SourceSpec(
+        name="world_recidivism",
+        pattern="world_recidivism_rates.csv",
+        clean=clean_world_recidivism,
+    ),
+    SourceSpec(
+        name="enara_3yr",
+        pattern="e_nara_3yr_reimprisonment.xlsx",
+        read_wide=_read_enara_wide,
+        id_cols={"metric": "metric"},
+        parse_header=_year_header,
+        value_name="value",
+        missing="drop",
+        integer=False,
+        thousands=",",
+    ),
+]
+SPECS: dict[str, SourceSpec] = {spec.name: spec for spec in SOURCES}
 
 
-def main() -> None:
-    DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
+def clean_prosecution_period_type(path: Path) -> pd.DataFrame:
+    return run_spec(SPECS["prosecution_period_type"], path)
 
-    clean_prosecution_period_type(DATA_RAW / "prosecution_reoffend_period_type_2017.csv") \
-        .to_csv(DATA_PROCESSED / "prosecution_reoffend_period_type_2017_tidy.csv", index=False, encoding="utf-8-sig")
 
-    clean_kosis_prior_convictions(DATA_RAW / "kosis_prior_convictions_2023.csv") \
-        .to_csv(DATA_PROCESSED / "kosis_prior_convictions_2023_tidy.csv", index=False, encoding="utf-8-sig")
+def clean_kosis_prior_convictions(path: Path) -> pd.DataFrame:
+    """KOSIS style CSV: first 2 rows are multi-headers for year columns."""
+    return run_spec(SPECS["kosis_prior_convictions"], path)
 
-    clean_police_education(DATA_RAW / "police_education_2020.csv") \
-        .to_csv(DATA_PROCESSED / "police_education_2020_tidy.csv", index=False, encoding="utf-8-sig")
 
-    clean_police_prior_record(DATA_RAW / "police_prior_record_2020.csv") \
-        .to_csv(DATA_PROCESSED / "police_prior_record_2020_tidy.csv", index=False, encoding="utf-8-sig")
+def clean_police_education(path: Path) -> pd.DataFrame:
+    return run_spec(SPECS["police_education"], path)
+
+
+def clean_police_prior_record(path: Path) -> pd.DataFrame:
+    return run_spec(SPECS["police_prior_record"], path)
 
-    clean_world_recidivism(DATA_RAW / "world_recidivism_rates.csv") \
-        .to_csv(DATA_PROCESSED / "world_recidivism_rates_tidy.csv", index=False, encoding="utf-8-sig")
 
-    clean_enara_3yr_excel(DATA_RAW / "e_nara_3yr_reimprisonment.xlsx") \
-        .to_csv(DATA_PROCESSED / "e_nara_3yr_reimprisonment_tidy.csv", index=False, encoding="utf-8-sig")
+def clean_enara_3yr_excel(path: Path) -> pd.DataFrame:
+    return run_spec(SPECS["enara_3yr"], path)
+
+
+def discover_tasks() -> list[tuple[str, str, str]]:
+    """Expand SOURCES into (source, raw_name, out_name) tasks, one per matching raw file."""
+    tasks = []
+    for spec in SOURCES:
+        matches = sorted(DATA_RAW.glob(spec.pattern))
+        if not matches:
+            print(f"  {spec.pattern}: no raw files")
+        tasks.extend((spec.name, raw.name, f"{raw.stem}_tidy.csv") for raw in matches)
+    return tasks
+
+
+def _vintage_year(raw_name: str) -> int | None:
+    m = VINTAGE.search(Path(raw_name).stem)
+    return int(m.group(1)) if m else None
+
+
+def _with_year(df: pd.DataFrame, year: int | None) -> pd.DataFrame:
+    """Stamp a vintage's rows with its year unless the table already has a year column (KOSIS)."""
+    if year is not None and "year" not in df.columns:
+        df.insert(0, "year", year)
+    return df
+
+
+def _reset_peak_rss() -> bool:
+    """Restart the kernel's peak-RSS counter (Linux only); False if it cannot be reset."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    """Peak RSS since the last _reset_peak_rss on Linux; elsewhere the process lifetime peak."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024  # kB
+    except OSError:
+        pass
+    if resource is None:
+        return float("nan")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def _streams(spec: SourceSpec, mem_budget_mb: float | None) -> bool:
+    return bool(mem_budget_mb) and spec.chunkable
+
+
+def _report_subtotals(out_name: str, validator: SubtotalValidator, seconds: float) -> None:
+    bad = validator.violations()
+    if bad.empty:
+        print(f"  {out_name}: subtotals ok ({validator.checked()} groups, {validator.rows} rows, {seconds:.3f}s)")
+        return
+    print(f"  {out_name}: ⚠ {len(bad)} subtotal mismatches ({seconds:.3f}s)")
+    print(bad.head(SUBTOTAL_REPORT_ROWS).dropna(axis=1, how="all").to_string(index=False))
+
+
+def _build(
+    source: str,
+    raw_name: str,
+    out_name: str,
+    fmt: str = "csv",
+    mem_budget_mb: float | None = None,
+    raw_sha: str | None = None,
+) -> float:
+    """Clean one raw file and write its tidy table; returns wall time in seconds.
+
+    ``raw_sha`` is the raw file's digest if the caller already has it, so the
+    UTF-8 mirror lookup does not hash the file again.
+
+    Sources with declared subtotals are checked on the same rows as they are
+    written (every chunk when streaming).
+    """
+    t0 = time.perf_counter()
+    spec = SPECS[source]
+    year = _vintage_year(raw_name)
+    validator = SubtotalValidator(spec.subtotals, spec.value_name) if spec.subtotals else None
+    check_s = 0.0
+
+    def check(df: pd.DataFrame) -> pd.DataFrame:
+        nonlocal check_s
+        if validator is not None:
+            t = time.perf_counter()
+            with span("validate", source=source, rows=len(df)):
+                validator.update(df)
+            check_s += time.perf_counter() - t
+        return df
+
+    with span(out_name, cat="build", source=source) as s:
+        if not _streams(spec, mem_budget_mb):
+            df = check(_with_year(run_spec(spec, DATA_RAW / raw_name, raw_sha), year))
+            write_tidy(df, DATA_PROCESSED / out_name, fmt)
+            s["rows"] = len(df)
+        else:
+            # Earlier builds in this process (serial runs, pool workers) must not
+            # count towards this stream's peak.
+            scoped = _reset_peak_rss()
+            start_mb = _peak_rss_mb()
+            with TidyWriter(DATA_PROCESSED / out_name, fmt) as writer:
+                for chunk in iter_spec(spec, DATA_RAW / raw_name, mem_budget_mb, raw_sha):
+                    writer.write(check(_with_year(chunk, year)))
+            s["rows"] = writer.rows
+            peak_mb = _peak_rss_mb()
+            if scoped:
+                peak = f"peak RSS {peak_mb:.0f} MB (+{peak_mb - start_mb:.0f} MB while streaming)"
+            else:
+                peak = f"process peak RSS {peak_mb:.0f} MB"
+            print(f"  {out_name}: streamed {writer.rows} rows, {peak}")
+    if validator is not None:
+        t = time.perf_counter()
+        _report_subtotals(out_name, validator, check_s + time.perf_counter() - t)
+    return time.perf_counter() - t0
+
+
+def _build_key(
+    source: str,
+    raw_name: str,
+    fmt: str,
+    mem_budget_mb: float | None,
+    raw_sha: str | None = None,
+) -> dict[str, str]:
+    spec = SPECS[source]
+    engine = iter_spec if _streams(spec, mem_budget_mb) else run_spec
+    # _build reaches the engine, transcoder, validator and writers across src.*;
+    # the engine is named separately so switching streaming on or off rebuilds.
+    parts = (source_sha256(engine), spec_sha256(spec), source_sha256(_build))
+    code = hashlib.sha256("".join(parts).encode("utf-8")).hexdigest()
+    return {"raw": raw_sha or file_sha256(DATA_RAW / raw_name), "code": code, "format": fmt}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Clean data/raw sources into tidy CSVs under data/processed.")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes for the cleaners (1 = serial)")
+    parser.add_argument("--force", action="store_true", help="rebuild every output, ignoring the manifest")
+    parser.add_argument("--format", default=default_format(),
+                        help=f"comma-separated tidy table formats from {', '.join(FORMATS)} or 'both' "
+                             "(= csv,parquet; the default when pyarrow is installed, else csv)")
+    parser.add_argument("--io-workers", type=int, default=2,
+                        help="threads reading raw files ahead of the cleaners (helps on network storage)")
+    parser.add_argument("--mem-budget-mb", type=float, default=None,
+                        help="stream CSV sources in row chunks so each chunk's working set stays under this budget")
+    add_profile_arguments(parser)
+    add_trace_argument(parser, "preprocess")
+    args = parser.parse_args(argv)
+    try:
+        parse_formats(args.format)
+    except (ValueError, RuntimeError) as e:
+        parser.error(str(e))
 
-    print("✅ processed csv saved to:", DATA_PROCESSED)
+    DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
+    profile = profile_options(args, "preprocess")
+    t0 = time.perf_counter()
+
+    # Skip files whose raw bytes, spec and engine code match the last build.
+    manifest = {} if args.force else load_manifest(MANIFEST)
+    tasks = discover_tasks()
+    rebuilt = reused = 0
+
+    def done(out_name: str, key: dict[str, str], elapsed: float) -> None:
+        manifest[out_name] = key
+        save_manifest(MANIFEST, manifest)
+        print(f"  {out_name}: {elapsed:.2f}s")
+
+    # Raw files are read (and hashed) ahead on threads, so each build's input
+    # is already in the page cache while the previous cleaner is still running.
+    with trace_to(args.trace, "preprocess"), RawPrefetcher(
+        [DATA_RAW / raw_name for _, raw_name, _ in tasks], args.io_workers
+    ) as prefetch:
+
+        def stale(task: tuple[str, str, str]) -> dict[str, str] | None:
+            """The task's build key if it must be rebuilt, else None."""
+            nonlocal rebuilt, reused
+            source, raw_name, out_name = task
+            key = _build_key(source, raw_name, args.format, args.mem_budget_mb, prefetch.sha256(DATA_RAW / raw_name))
+            if manifest.get(out_name) == key and tidy_exists(DATA_PROCESSED / out_name, args.format):
+                reused += 1
+                print(f"  {out_name}: reused")
+                return None
+            rebuilt += 1
+            return key
+
+        if args.jobs <= 1:
+            for task in tasks:
+                key = stale(task)
+                if key is not None:
+                    elapsed = profiled(profile, task[2], _build, *task, args.format, args.mem_budget_mb, key["raw"])
+                    done(task[2], key, elapsed)
+        else:
+            # Tasks (every vintage of every source) share no state, so the run is
+            # bounded by the slowest file rather than the sum.
+            with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+                futures = {}
+                for task in tasks:
+                    key = stale(task)
+                    if key is not None:
+                        fut = pool.submit(
+                            profiled, profile, task[2], _build, *task, args.format, args.mem_budget_mb, key["raw"]
+                        )
+                        futures[fut] = (task[2], key)
+                for fut in as_completed(futures):
+                    done(*futures[fut], fut.result())
+    print(f"  {prefetch.summary()}")
+    print(f"  total: {time.perf_counter() - t0:.2f}s (rebuilt {rebuilt}, reused {reused})")
+    print("✅ processed tables saved to:", DATA_PROCESSED)
 
 
 if __name__ == "__main__":
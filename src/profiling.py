@@ -0,0 +1,150 @@
+"""Per-stage profiling for the entry points (``--profile``).
+
+    python -m src.preprocess --profile                      # cProfile + tracemalloc
+    python -m src.visualize --profile sample --profile-only 03_
+
+Every profiled stage (one cleaner build, table, figure or pipeline node)
+writes to outputs/profiles/<entry point>/:
+
+- ``<stage>.prof`` and ``<stage>.cumulative.txt``: cProfile stats (pstats,
+  snakeviz) and the top functions by cumulative time; or, with ``--profile sample``,
+- ``<stage>.folded``: stacks sampled every few milliseconds, in the collapsed
+  format flamegraph.pl and speedscope read. Much cheaper than cProfile on
+  stages that make many small pandas calls.
+- ``<stage>.alloc.txt``: the tracemalloc peak and the top allocation sites
+  still live when the stage ended.
+
+tracemalloc slows allocation-heavy code, so compare profiled runs with each
+other rather than with unprofiled timings.
+"""
+from __future__ import annotations
+import argparse
+import cProfile
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+from .config import OUTPUTS
+
+PROFILE_DIR = OUTPUTS / "profiles"
+MODES = ("cprofile", "sample")
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+TOP = 30  # rows in the .txt and .alloc.txt reports
+
+
+@dataclass(frozen=True)
+class ProfileOptions:
+    mode: str  # "cprofile" or "sample"
+    entry: str  # entry point name, the subdirectory under PROFILE_DIR
+    only: str | None = None  # profile only stages whose name contains this
+
+    def wants(self, stage: str) -> bool:
+        return self.only is None or self.only in stage
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--profile", nargs="?", const="cprofile", default=None, choices=MODES,
+                        help="profile every stage with cProfile (default) or a stack sampler, plus tracemalloc, "
+                             f"writing to {PROFILE_DIR}")
+    parser.add_argument("--profile-only", default=None, metavar="TEXT",
+                        help="profile only stages whose name contains TEXT")
+
+
+def profile_options(args: argparse.Namespace, entry: str) -> ProfileOptions | None:
+    return ProfileOptions(args.profile, entry, args.profile_only) if args.profile else None
+
+
+class _Sampler:
+    """Counts the calling thread's stacks from a background thread."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    # Same names as cProfile.Profile, so stage() can treat both alike.
+    def enable(self) -> None:
+        self._thread.start()
+
+    def disable(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _write_allocations(path: Path, snapshot: tracemalloc.Snapshot, peak: int) -> None:
+    stats = snapshot.statistics("lineno")
+    live = sum(s.size for s in stats)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"peak traced: {peak / 2**20:.1f} MB, still live at the end: {live / 2**20:.1f} MB\n\n")
+        for s in stats[:TOP]:
+            frame = s.traceback[0]
+            f.write(f"{s.size / 2**20:9.2f} MB {s.count:9d} blocks  {frame.filename}:{frame.lineno}\n")
+
+
+@contextmanager
+def stage(opts: ProfileOptions | None, name: str) -> Iterator[None]:
+    """Profile the body as stage ``name`` when ``opts`` asks for it; otherwise just run it."""
+    if opts is None or not opts.wants(name):
+        yield
+        return
+    out_dir = PROFILE_DIR / opts.entry
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = str(out_dir / Path(name).stem)
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    profiler = cProfile.Profile() if opts.mode == "cprofile" else _Sampler()
+    t0 = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        if not tracing:
+            tracemalloc.stop()
+
+        if opts.mode == "cprofile":
+            profiler.dump_stats(stem + ".prof")
+            with open(stem + ".cumulative.txt", "w", encoding="utf-8") as f:
+                pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(TOP)
+        else:
+            profiler.write(stem + ".folded")
+        _write_allocations(stem + ".alloc.txt", snapshot, peak)
+        print(f"  profile {name}: {elapsed:.2f}s, peak {peak / 2**20:.1f} MB -> {stem}.*")
+
+
+def profiled(opts: ProfileOptions | None, name: str, func: Callable, *args):
+    """``func(*args)`` as one profiled stage; module level so worker processes can run it."""
+    with stage(opts, name):
+        return func(*args)
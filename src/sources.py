@@ -0,0 +1,171 @@
+"""Declarative raw-source specs and the single wide-to-long engine that runs them."""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator
+from .cache import utf8_mirror
+from .config import DATA_PROCESSED
+from .lazy import lazy_import
+from .tracing import iter_spans, span
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+UTF8_CACHE = DATA_PROCESSED / "_utf8_cache"
+PROBE_ROWS = 64
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """One raw source: which files it owns and how its wide table maps to tidy rows.
+
+    Wide tables are described by ``id_cols`` and ``parse_header``; sources that
+    are not wide tables (e.g. the world rates list) set ``clean`` instead.
+    """
+
+    name: str
+    pattern: str  # glob under data/raw
+    id_cols: dict[str, str] = field(default_factory=dict)  # raw label -> tidy name
+    # Value-column header -> Index/MultiIndex whose level names become tidy columns.
+    # Receives the value columns plus ``header_rows`` extra header rows (KOSIS: 2).
+    parse_header: Callable[[pd.DataFrame], pd.Index] | None = None
+    header_rows: int = 0
+    # None = detect when building the UTF-8 mirror (utf-8-sig, then cp949); set only
+    # to force an encoding detection cannot tell apart.
+    encoding: str | None = None
+    value_name: str = "count"
+    missing: str = "zero"  # non-numeric cells: "zero" counts them as 0, "drop" drops the row
+    integer: bool = True
+    # Applied by the parser, so value columns come out numeric rather than as strings.
+    thousands: str | None = None
+    na_values: tuple[str, ...] = ()  # extra missing-value markers, e.g. KOSIS "-"
+    columns: tuple[str, ...] | None = None  # output order; default ids + header levels + value
+    # Tidy-column hierarchies (coarse -> fine) whose 합계/소계 rows must equal the sum of their children.
+    subtotals: tuple[tuple[str, ...], ...] = ()
+    # Non-CSV sources (Excel): called as read_wide(path, thousands=..., na_values=...).
+    read_wide: Callable[..., pd.DataFrame] | None = None
+    # Called as clean(path, sha256=...) with the raw file's digest when the caller has it.
+    clean: Callable[..., pd.DataFrame] | None = None
+
+    @property
+    def chunkable(self) -> bool:
+        return self.clean is None and self.read_wide is None
+
+    def parse_options(self) -> dict:
+        """Number parsing options shared by the CSV and Excel readers."""
+        return {"thousands": self.thousands, "na_values": list(self.na_values)}
+
+
+def read_raw_csv(path: Path, encoding: str | None = None, sha256: str | None = None, **kwargs) -> pd.DataFrame:
+    """read_csv on the UTF-8 mirror of a raw export, whatever its original encoding.
+
+    ``sha256`` is the file's digest if already known (e.g. from the prefetcher).
+    """
+    with span("read", file=path.name) as s:
+        df = pd.read_csv(utf8_mirror(path, UTF8_CACHE, encoding, sha256), encoding="utf-8", **kwargs)
+        s["rows"] = len(df)
+    return df
+
+
+def stack_wide(spec: SourceSpec, body: pd.DataFrame, header: pd.Index) -> pd.DataFrame:
+    """Wide block -> tidy long rows, in melt order (column-major), via one numpy ravel."""
+    first = next(iter(spec.id_cols))
+    is_data = body[first].astype(str) != first  # header lines repeated inside the body
+    if not is_data.all():
+        body = body[is_data]
+    n_rows, n_cols = len(body), len(header)
+
+    # A homogeneous int block is stored column-major by pandas, so the
+    # Fortran-order ravel below is a view rather than a copy.
+    values = body.drop(columns=list(spec.id_cols)).to_numpy().ravel(order="F")
+    keep = slice(None)
+    with span("coerce", source=spec.name, rows=len(values), dtype=values.dtype.str):
+        if values.dtype.kind not in "iuf":
+            # Cells the parser could not read as numbers (an undeclared NA marker).
+            values = pd.Series(values)
+            if spec.thousands:
+                values = values.astype(str).str.replace(spec.thousands, "", regex=False)
+            values = pd.to_numeric(values, errors="coerce").to_numpy()
+        if values.dtype.kind == "f":
+            if spec.missing == "drop":
+                keep = ~np.isnan(values)
+            else:
+                values = np.nan_to_num(values, nan=0.0)
+
+    with span("melt", source=spec.name, cells=n_rows * n_cols) as s:
+        long = {}
+        for raw, tidy in spec.id_cols.items():
+            long[tidy] = np.tile(body[raw].to_numpy(), n_cols)[keep]
+        for level in header.names:
+            long[level] = header.get_level_values(level).to_numpy().repeat(n_rows)[keep]
+        long[spec.value_name] = values[keep].astype(int, copy=False) if spec.integer else values[keep]
+
+        out = pd.DataFrame(long)
+        s["rows"] = len(out)
+    return out[list(spec.columns)] if spec.columns else out
+
+
+def _read_csv_parts(
+    spec: SourceSpec, path: Path, sha256: str | None = None
+) -> tuple[pd.DataFrame, Callable[..., pd.DataFrame]]:
+    """Header frame (value columns + extra header rows) and a reader for the body."""
+    mirror = utf8_mirror(path, UTF8_CACHE, spec.encoding, sha256)
+    head = pd.read_csv(mirror, encoding="utf-8", nrows=spec.header_rows)
+    head = head.drop(columns=list(spec.id_cols))
+
+    def read_body(**kwargs):
+        # Skip the extra header rows parsed into ``head``. Labels are read as
+        # text; numbers, separators and NA markers are left to the C parser.
+        return pd.read_csv(
+            mirror, encoding="utf-8", skiprows=range(1, 1 + spec.header_rows),
+            dtype={col: str for col in spec.id_cols}, **spec.parse_options(), **kwargs,
+        )
+
+    return head, read_body
+
+
+def run_spec(spec: SourceSpec, path: Path, sha256: str | None = None) -> pd.DataFrame:
+    """Clean one raw file according to its spec; ``sha256`` is its digest if known."""
+    if spec.clean is not None:
+        return spec.clean(path, sha256=sha256)
+    if spec.read_wide is not None:
+        with span("read", file=path.name) as s:
+            wide = spec.read_wide(path, **spec.parse_options())
+            s["rows"] = len(wide)
+        return stack_wide(spec, wide, spec.parse_header(wide.drop(columns=list(spec.id_cols))))
+
+    head, read_body = _read_csv_parts(spec, path, sha256)
+    with span("read", file=path.name) as s:
+        body = read_body()
+        s["rows"] = len(body)
+    return stack_wide(spec, body, spec.parse_header(head))
+
+
+def iter_spec(
+    spec: SourceSpec, path: Path, mem_budget_mb: float = 256.0, sha256: str | None = None
+) -> Iterator[pd.DataFrame]:
+    """Chunked run_spec for very large CSV sources.
+
+    Header rows are parsed once. Body rows are then read and stacked in
+    chunks sized from a probe so that one wide chunk plus its long copy stays
+    within ``mem_budget_mb``. Non-CSV sources are yielded whole.
+    """
+    if not spec.chunkable:
+        yield run_spec(spec, path, sha256)
+        return
+
+    head, read_body = _read_csv_parts(spec, path, sha256)
+    header = spec.parse_header(head)
+
+    probe = read_body(nrows=PROBE_ROWS)
+    if probe.empty:
+        return
+    stacked = stack_wide(spec, probe, header)
+    bytes_per_row = (probe.memory_usage(deep=True).sum() + stacked.memory_usage(deep=True).sum()) / len(probe)
+    # x2 headroom for the transient value/id arrays built while stacking.
+    chunk_rows = max(1, int(mem_budget_mb * 2**20 / (2 * bytes_per_row)))
+    del probe, stacked
+
+    with read_body(chunksize=chunk_rows) as reader:
+        for chunk in iter_spans(reader, "read", file=path.name):
+            yield stack_wide(spec, chunk, header)
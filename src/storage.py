@@ -0,0 +1,354 @@
+"""Tidy-table I/O: each table is addressed by its ``*_tidy.csv`` path and may have
+a Parquet sibling (dictionary-encoded labels, integer counts) and a memory-mapped
+``.mmap`` directory (one .npy per column plus label dictionaries) that readers prefer."""
+from __future__ import annotations
+import importlib.util
+import json
+import shutil
+from pathlib import Path
+from .lazy import lazy_import
+from .tracing import span
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Checked without importing pyarrow, which pandas loads itself when Parquet is used.
+HAS_PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+FORMATS = ("csv", "parquet", "mmap")
+FORMAT_ALIASES = {"both": ("csv", "parquet")}
+# Label columns with more distinct values than this share of rows are kept as
+# Arrow strings rather than categoricals.
+CATEGORY_MAX_RATIO = 0.5
+
+
+def default_format() -> str:
+    return "both" if HAS_PARQUET else "csv"
+
+
+def parse_formats(fmt: str) -> tuple[str, ...]:
+    """"csv", "both", "csv,mmap", ... -> the individual formats to write."""
+    out: list[str] = []
+    for part in fmt.split(","):
+        part = part.strip()
+        for name in FORMAT_ALIASES.get(part, (part,)):
+            if name not in FORMATS:
+                raise ValueError(f"Unknown output format: {name!r} (choose from {', '.join(FORMATS)}, both)")
+            if name == "parquet" and not HAS_PARQUET:
+                raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow).")
+            if name not in out:
+                out.append(name)
+    return tuple(out)
+
+
+def parquet_path(csv_path: Path) -> Path:
+    return csv_path.with_suffix(".parquet")
+
+
+def mmap_dir(csv_path: Path) -> Path:
+    return csv_path.with_suffix(".mmap")
+
+
+def to_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """Give each column the dtype a CSV round trip would infer; labels become categoricals."""
+    out = df.copy()
+    for col in out.columns:
+        if out[col].dtype != object:
+            continue
+        numeric = pd.to_numeric(out[col], errors="coerce")
+        if numeric.notna().sum() == out[col].notna().sum():
+            out[col] = numeric
+        else:
+            out[col] = out[col].astype("category")
+    return out
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Memory-lean copy: labels become categoricals (or Arrow strings when nearly
+    unique) and non-negative integer columns the smallest unsigned int that fits."""
+    out = df.copy()
+    for col in out.columns:
+        s = out[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            # Parquet dictionaries come back in first-seen order; sort so that
+            # sort_values/groupby order matches plain strings.
+            out[col] = s.cat.reorder_categories(sorted(s.cat.categories))
+        elif s.dtype == object:
+            if HAS_PARQUET and s.nunique() > CATEGORY_MAX_RATIO * len(s):
+                out[col] = s.astype("string[pyarrow]")
+            else:
+                out[col] = s.astype("category").cat.as_unordered()
+        elif pd.api.types.is_integer_dtype(s) and (s.empty or s.min() >= 0):
+            out[col] = pd.to_numeric(s, downcast="unsigned")
+    return out
+
+
+def memory_report(tables: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Deep memory of each table before and after compact_dtypes, in KiB."""
+    rows = []
+    for name, df in tables.items():
+        before = df.memory_usage(deep=True).sum()
+        after = compact_dtypes(df).memory_usage(deep=True).sum()
+        rows.append({"table": name, "rows": len(df), "before_kib": before / 1024, "after_kib": after / 1024,
+                     "ratio": after / before if before else 1.0})
+    return pd.DataFrame(rows)
+
+
+def write_mmap(df: pd.DataFrame, csv_path: Path) -> None:
+    """Store each column as a .npy file: numbers as-is, labels as integer codes into a
+    sorted label dictionary kept in meta.json. meta.json is written last."""
+    out = mmap_dir(csv_path)
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+
+    columns = []
+    for i, (name, s) in enumerate(to_columnar(df).items()):
+        entry = {"name": name, "file": f"c{i}.npy"}
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            codes, labels = pd.factorize(s.astype(object), sort=True)
+            arr = codes.astype(np.min_scalar_type(-max(len(labels), 1)))
+            entry["labels"] = labels.tolist()
+        else:
+            arr = s.to_numpy()
+        np.save(out / entry["file"], arr)
+        columns.append(entry)
+    (out / "meta.json").write_text(json.dumps({"columns": columns}, ensure_ascii=False), encoding="utf-8")
+
+
+class _MmapSpool:
+    """Build the .mmap directory of a table written in row chunks, without holding it.
+
+    Each chunk is appended to one raw spool file per column: numbers as-is,
+    labels as provisional codes in first-seen order. close() writes the final
+    .npy files block by block, with the label dictionaries sorted as in
+    write_mmap, so the result matches writing the whole table at once. Memory
+    grows with the number of distinct labels (meta.json holds them all), not rows.
+    """
+
+    BLOCK = 1 << 20
+
+    def __init__(self, csv_path: Path) -> None:
+        self.dir = mmap_dir(csv_path)
+        if self.dir.exists():
+            shutil.rmtree(self.dir)
+        self.dir.mkdir(parents=True)
+        self.names: list[str] = []
+        # Per column: label -> provisional code, or None for numeric columns.
+        self.labels: list[dict | None] = []
+        self.numeric_labels: list[bool] = []  # every label parses as a number
+        self.missing: list[bool] = []
+        self.segments: list[list[tuple[str, int]]] = []  # (dtype, length) of each chunk
+        self.rows = 0
+
+    def _part(self, i: int) -> Path:
+        return self.dir / f"c{i}.part"
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if not self.names:
+            self.names = list(chunk.columns)
+            for _, s in chunk.items():
+                is_label = s.dtype == object or isinstance(s.dtype, pd.CategoricalDtype)
+                self.labels.append({} if is_label else None)
+                self.numeric_labels.append(True)
+                self.missing.append(False)
+                self.segments.append([])
+        elif list(chunk.columns) != self.names:
+            raise ValueError(f"Chunk columns {list(chunk.columns)} differ from {self.names}")
+
+        for i, (name, s) in enumerate(chunk.items()):
+            labels = self.labels[i]
+            if labels is not None:
+                s = s.astype(object)
+                codes, uniques = pd.factorize(s)
+                ids = np.array([labels.setdefault(u, len(labels)) for u in uniques] + [-1], dtype=np.int32)
+                arr = ids[codes]  # code -1 (missing) picks the trailing -1
+                self.missing[i] = self.missing[i] or bool((codes < 0).any())
+                if self.numeric_labels[i]:
+                    self.numeric_labels[i] = bool(pd.to_numeric(s, errors="coerce").notna().sum() == s.notna().sum())
+            elif s.dtype == object or isinstance(s.dtype, pd.CategoricalDtype):
+                raise ValueError(f"Column {name!r} holds numbers in one chunk and labels in another")
+            else:
+                arr = np.ascontiguousarray(s.to_numpy())
+            with open(self._part(i), "ab") as fh:
+                arr.tofile(fh)
+            self.segments[i].append((arr.dtype.str, len(arr)))
+        self.rows += len(chunk)
+
+    def _copy(self, i: int, path: Path, dtype, convert=None) -> None:
+        """Write spool ``i`` as a .npy of ``dtype``, mapping codes through ``convert``."""
+        header = {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False, "shape": (self.rows,)}
+        with open(self._part(i), "rb") as src, open(path, "wb") as out:
+            np.lib.format.write_array_header_1_0(out, header)
+            for seg_dtype, length in self.segments[i]:
+                for start in range(0, length, self.BLOCK):
+                    block = np.fromfile(src, dtype=seg_dtype, count=min(self.BLOCK, length - start))
+                    (block if convert is None else convert[block]).astype(dtype, copy=False).tofile(out)
+        self._part(i).unlink()
+
+    def close(self) -> None:
+        if not self.rows:
+            shutil.rmtree(self.dir)
+            return
+        columns = []
+        for i, name in enumerate(self.names):
+            entry = {"name": name, "file": f"c{i}.npy"}
+            labels = self.labels[i]
+            if labels is None:
+                dtype = np.result_type(*(np.dtype(d) for d, _ in self.segments[i]))
+                self._copy(i, self.dir / entry["file"], dtype)
+            elif self.numeric_labels[i] and labels:
+                # Numbers stored as text: the whole-table CSV round trip reads them as numbers.
+                values = pd.to_numeric(pd.Series(list(labels), dtype=object)).to_numpy()
+                values = np.append(values.astype(float), np.nan) if self.missing[i] else values
+                self._copy(i, self.dir / entry["file"], values.dtype, values)
+            else:
+                keys = list(labels)
+                order = sorted(range(len(keys)), key=keys.__getitem__)
+                remap = np.empty(len(keys) + 1, dtype=np.int64)
+                remap[order] = np.arange(len(keys))
+                remap[-1] = -1
+                self._copy(i, self.dir / entry["file"], np.min_scalar_type(-max(len(keys), 1)), remap)
+                entry["labels"] = [keys[j] for j in order]
+            columns.append(entry)
+        (self.dir / "meta.json").write_text(json.dumps({"columns": columns}, ensure_ascii=False), encoding="utf-8")
+
+
+def read_mmap(csv_path: Path, object_labels: bool = False) -> pd.DataFrame:
+    """Open a table written by write_mmap without reading it: numeric columns are
+    read-only memory maps shared through the OS page cache, and label columns
+    categoricals over the mapped codes, so opening costs the same at any size.
+
+    ``object_labels=True`` materialises labels as object arrays instead (one
+    pointer per row, so time and memory grow with the table).
+    """
+    src = mmap_dir(csv_path)
+    meta = json.loads((src / "meta.json").read_text(encoding="utf-8"))
+    data = {}
+    for entry in meta["columns"]:
+        arr = np.load(src / entry["file"], mmap_mode="r")
+        if "labels" in entry:
+            labels = pd.Categorical.from_codes(arr, categories=pd.Index(entry["labels"], dtype=object))
+            data[entry["name"]] = np.asarray(labels) if object_labels else labels
+        else:
+            data[entry["name"]] = arr
+    return pd.DataFrame(data, copy=False)
+
+
+def write_tidy(df: pd.DataFrame, csv_path: Path, fmt: str = "csv") -> None:
+    formats = parse_formats(fmt)
+    with span("write", table=csv_path.name, format=fmt, rows=len(df)):
+        if "csv" in formats:
+            df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+        if "parquet" in formats:
+            to_columnar(df).to_parquet(parquet_path(csv_path), index=False)
+        if "mmap" in formats:
+            write_mmap(df, csv_path)
+
+
+class TidyWriter:
+    """Append row chunks of one tidy table to its CSV, Parquet and/or mmap output.
+
+    The mmap columns are spooled per chunk and finished on close (_MmapSpool).
+    """
+
+    def __init__(self, csv_path: Path, fmt: str = "csv") -> None:
+        self.formats = parse_formats(fmt)
+        self.csv_path = csv_path
+        self.rows = 0
+        self._csv = open(csv_path, "w", encoding="utf-8-sig", newline="") if "csv" in self.formats else None
+        self._parquet = None
+        self._mmap = _MmapSpool(csv_path) if "mmap" in self.formats else None
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        with span("write", table=self.csv_path.name, rows=len(chunk)):
+            self._write(chunk)
+        self.rows += len(chunk)
+
+    def _write(self, chunk: pd.DataFrame) -> None:
+        if self._csv is not None:
+            chunk.to_csv(self._csv, index=False, header=self.rows == 0)
+        if "parquet" in self.formats:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            # Plain strings keep the schema stable across chunks; Parquet still
+            # dictionary-encodes them on disk.
+            cols = to_columnar(chunk)
+            for col in cols.columns:
+                if isinstance(cols[col].dtype, pd.CategoricalDtype):
+                    cols[col] = cols[col].astype(object)
+            table = pa.Table.from_pandas(cols, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(parquet_path(self.csv_path), table.schema)
+            self._parquet.write_table(table.cast(self._parquet.schema))
+        if self._mmap is not None:
+            self._mmap.write(chunk)
+
+    def close(self) -> None:
+        if self._csv is not None:
+            self._csv.close()
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self) -> "TidyWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _stamp_paths(csv_path: Path) -> dict[str, Path]:
+    return {"mmap": mmap_dir(csv_path) / "meta.json", "parquet": parquet_path(csv_path), "csv": csv_path}
+
+
+def tidy_exists(csv_path: Path, fmt: str = "csv") -> bool:
+    stamps = _stamp_paths(csv_path)
+    return all(stamps[name].exists() for name in parse_formats(fmt))
+
+
+def _current_format(csv_path: Path) -> str:
+    """The fastest representation that is at least as new as every other one on disk."""
+    mtimes = {
+        name: path.stat().st_mtime
+        for name, path in _stamp_paths(csv_path).items()
+        if path.exists() and (name != "parquet" or HAS_PARQUET)
+    }
+    if not mtimes:
+        raise FileNotFoundError(f"No tidy table at {csv_path}")
+    newest = max(mtimes.values())
+    return next(name for name in ("mmap", "parquet", "csv") if mtimes.get(name, -1) >= newest)
+
+
+def read_tidy(csv_path: Path, compact: bool = False, object_labels: bool = False) -> pd.DataFrame:
+    """Load a tidy table from its freshest representation: mmap, then Parquet, then CSV.
+
+    With ``compact=True`` labels come back as categoricals (see compact_dtypes);
+    memory-mapped numeric columns are left as maps since they cost no private RAM.
+    Without it CSV and Parquet labels are plain object columns, while mmap tables
+    keep their categoricals unless ``object_labels=True`` (see read_mmap).
+    """
+    fmt = _current_format(csv_path)
+    with span("read", table=csv_path.name, format=fmt) as s:
+        df = _read_format(csv_path, fmt, compact, object_labels)
+        s["rows"] = len(df)
+    return df
+
+
+def _read_format(csv_path: Path, fmt: str, compact: bool, object_labels: bool = False) -> pd.DataFrame:
+    if fmt == "mmap":
+        return read_mmap(csv_path, object_labels=object_labels and not compact)
+    if fmt == "csv":
+        df = pd.read_csv(csv_path, encoding="utf-8-sig")
+        return compact_dtypes(df) if compact else df
+
+    df = pd.read_parquet(parquet_path(csv_path))
+    if compact:
+        return compact_dtypes(df)
+    # Hand consumers plain string labels, same as the CSV path.
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    return df
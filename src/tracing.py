@@ -0,0 +1,128 @@
+"""Span instrumentation exported as a Chrome trace (``--trace``).
+
+    python -m src.preprocess --jobs 4 --trace      # -> outputs/traces/preprocess.json
+
+Open the file in chrome://tracing or https://ui.perfetto.dev. Each process
+(the main one and every ``--jobs`` worker) gets its own row, so overlapping
+builds show up side by side; nested spans (read, melt, coerce, aggregate,
+draw, savefig, ...) carry the number of rows they handled in their args.
+
+Spans cost one ``os.environ`` lookup while tracing is off. While it is on,
+every process appends finished spans to its own part file next to the trace,
+which works the same with fork and spawn pools; they are merged at the end.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, TypeVar
+from .config import OUTPUTS
+
+TRACE_DIR = OUTPUTS / "traces"
+TRACE_ENV = "CRIMINAL_ANALYSIS_TRACE"  # part-file directory, inherited by worker processes
+T = TypeVar("T")
+
+_sink: tuple[int, object] | None = None  # (pid, open part file) in this process
+
+
+def add_trace_argument(parser: argparse.ArgumentParser, entry: str) -> None:
+    parser.add_argument("--trace", nargs="?", const=TRACE_DIR / f"{entry}.json", default=None, type=Path,
+                        metavar="PATH", help=f"write a Chrome trace of the run (default {TRACE_DIR}/{entry}.json)")
+
+
+def _parts_dir(path: Path) -> Path:
+    return path.with_name(path.name + ".parts")
+
+
+def _start(path: Path) -> None:
+    parts = _parts_dir(path)
+    parts.mkdir(parents=True, exist_ok=True)
+    for old in parts.glob("*.jsonl"):  # left behind by an interrupted run
+        old.unlink()
+    os.environ[TRACE_ENV] = str(parts)
+
+
+def _stop(path: Path) -> int:
+    """Merge every process's spans into ``path``; returns the number of spans."""
+    global _sink
+    if _sink is not None:
+        _sink[1].close()
+        _sink = None
+    parts = Path(os.environ.pop(TRACE_ENV))
+    events = []
+    for part in sorted(parts.glob("*.jsonl")):
+        with open(part, encoding="utf-8") as f:
+            events += [json.loads(line) for line in f]
+        part.unlink()
+    parts.rmdir()
+
+    main_pid = os.getpid()
+    meta = [
+        {"ph": "M", "name": "process_name", "pid": pid, "tid": 0,
+         "args": {"name": "main" if pid == main_pid else f"worker {pid}"}}
+        for pid in sorted({e["pid"] for e in events})
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"traceEvents": meta + events, "displayTimeUnit": "ms"}), encoding="utf-8")
+    return len(events)
+
+
+@contextmanager
+def trace_to(path: Path | None, entry: str) -> Iterator[None]:
+    """Record spans while the body runs (as one ``entry`` span) and write them to ``path``; no-op for None."""
+    if path is None:
+        yield
+        return
+    _start(path)
+    try:
+        with span(entry, cat="run"):
+            yield
+    finally:
+        print(f"  trace: {_stop(path)} spans -> {path}")
+
+
+def _write(event: dict) -> None:
+    global _sink
+    pid = os.getpid()
+    if _sink is None or _sink[0] != pid:  # first span here, or a forked child holding the parent's file
+        parts = Path(os.environ[TRACE_ENV])
+        _sink = (pid, open(parts / f"{pid}.jsonl", "a", encoding="utf-8"))
+    _sink[1].write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+    _sink[1].flush()
+
+
+@contextmanager
+def span(name: str, cat: str = "stage", **args) -> Iterator[dict]:
+    """Time the body as one trace event. Yields its args dict, so the body can
+    add what it only learns while running, e.g. ``s["rows"] = len(df)``."""
+    if TRACE_ENV not in os.environ:
+        yield args
+        return
+    # perf_counter is a system-wide monotonic clock on Linux, macOS and
+    # Windows, so spans from different processes line up.
+    t0 = time.perf_counter_ns()
+    try:
+        yield args
+    finally:
+        _write({
+            "name": name, "cat": cat, "ph": "X",
+            "ts": t0 / 1000, "dur": (time.perf_counter_ns() - t0) / 1000,
+            "pid": os.getpid(), "tid": threading.get_ident(), "args": args,
+        })
+
+
+def iter_spans(items: Iterable[T], name: str, cat: str = "stage", **args) -> Iterator[T]:
+    """Yield from ``items`` with each ``next()`` (e.g. reading one chunk) as a span."""
+    it = iter(items)
+    while True:
+        with span(name, cat, **args) as s:
+            item = next(it, None)
+            if item is not None:
+                s["rows"] = len(item)
+        if item is None:
+            return
+        yield item
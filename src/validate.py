@@ -0,0 +1,145 @@
+"""Subtotal integrity checks for tidy tables with hierarchical labels (KOSIS 합계/소계)."""
+from __future__ import annotations
+from typing import Sequence
+from .lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+TOTAL_LABELS = ("합계", "소계")
+SUMS = ("parent", "children", "n_children")
+
+
+def _mix(h: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Combine two uint64 hash arrays (order-sensitive, wraps around)."""
+    return (h ^ x) * np.uint64(0x100000001B3) + np.uint64(0x9E3779B97F4A7C15)
+
+
+class SubtotalValidator:
+    """Checks that every subtotal equals the sum of its children.
+
+    Each hierarchy is a tuple of tidy columns from coarse to fine, e.g.
+    ``("crime_lvl1", "crime_lvl2", "crime_lvl3")``. At depth ``j`` a parent row
+    carries a total label at levels ``j..`` and a child row a real label at
+    ``j`` and totals below it; both are matched on every other column. Cells
+    absent from the table (dropped "-") count as zero.
+
+    ``update`` reduces each chunk to per-parent sums keyed by a 64-bit hash of
+    the parent's labels, so the rows themselves are never kept. A parent whose
+    key does not occur in the latest chunk is final: it is checked and dropped,
+    keeping only mismatches. State therefore stays bounded by the parents open
+    across one chunk boundary, as long as each parent's rows arrive in
+    consecutive chunks (true for the hierarchy-ordered wide exports and for a
+    single whole-table update).
+    """
+
+    def __init__(
+        self,
+        hierarchies: Sequence[tuple[str, ...]],
+        value: str,
+        totals: Sequence[str] = TOTAL_LABELS,
+    ) -> None:
+        self.hierarchies = [tuple(h) for h in hierarchies]
+        self.value = value
+        self.totals = list(totals)
+        self.rows = 0
+        self._checked = 0
+        # (hierarchy, depth) -> open parents: "hash", the sums and one array per key column.
+        self._open: dict[tuple[int, int], dict[str, np.ndarray]] = {}
+        self._bad: list[pd.DataFrame] = []
+
+    def update(self, df: pd.DataFrame) -> None:
+        self.rows += len(df)
+        values = df[self.value].to_numpy(dtype=float)
+        # Factorize each label column once; the checks below only touch integer
+        # codes and per-row hashes of the labels.
+        labels, is_total, hashes = {}, {}, {}
+        for col in df.columns:
+            if col != self.value:
+                # Missing labels get code -1, which picks the trailing slot below.
+                codes, uniques = pd.factorize(df[col])
+                labels[col] = df[col].to_numpy()
+                is_total[col] = np.append(uniques.isin(self.totals), False)[codes]
+                hashes[col] = np.append(pd.util.hash_array(np.asarray(uniques, dtype=object)), np.uint64(0))[codes]
+
+        for hi, levels in enumerate(self.hierarchies):
+            for depth in range(len(levels)):
+                above = np.ones(len(df), dtype=bool)
+                for col in levels[:depth]:
+                    above &= ~is_total[col]
+                below = above.copy()
+                for col in levels[depth + 1:]:
+                    below &= is_total[col]
+                parent = below & is_total[levels[depth]]
+                child = below & ~is_total[levels[depth]]
+                rows = np.flatnonzero(parent | child)
+                if not len(rows):
+                    continue
+
+                keys = [c for c in df.columns if c != self.value and c not in levels[depth:]]
+                h = np.zeros(len(rows), dtype=np.uint64)
+                for c in keys:
+                    h = _mix(h, hashes[c][rows])
+                ids, uniq = pd.factorize(h)
+                n = len(uniq)
+                is_child = child[rows]
+                first = np.full(n, -1)
+                first[ids[::-1]] = rows[::-1]
+                sums = {
+                    "hash": np.asarray(uniq, dtype=np.uint64),
+                    "parent": np.bincount(ids, weights=np.where(is_child, 0.0, values[rows]), minlength=n),
+                    "children": np.bincount(ids, weights=np.where(is_child, values[rows], 0.0), minlength=n),
+                    "n_children": np.bincount(ids, weights=is_child, minlength=n),
+                    **{c: labels[c][first] for c in keys},
+                }
+                self._advance((hi, depth), sums)
+
+    def _advance(self, key: tuple[int, int], sums: dict[str, np.ndarray]) -> None:
+        """Add one chunk's parents to the open ones; finish those the chunk did not touch."""
+        prev = self._open.get(key)
+        if prev is not None:
+            both = {name: np.concatenate([prev[name], arr]) for name, arr in sums.items()}
+            ids, uniq = pd.factorize(both["hash"])
+            n = len(uniq)
+            first = np.full(n, -1)
+            first[ids[::-1]] = np.arange(len(ids))[::-1]
+            merged = {name: arr[first] for name, arr in both.items() if name not in SUMS}
+            merged.update({name: np.bincount(ids, weights=both[name], minlength=n) for name in SUMS})
+            touched = np.zeros(n, dtype=bool)
+            touched[ids[len(prev["hash"]):]] = True
+            self._finish(key, {name: arr[~touched] for name, arr in merged.items()})
+            sums = {name: arr[touched] for name, arr in merged.items()}
+        self._open[key] = sums
+
+    def _finish(self, key: tuple[int, int], sums: dict[str, np.ndarray]) -> None:
+        has_children = sums["n_children"] > 0
+        self._checked += int(has_children.sum())
+        bad = self._mismatches(key, sums)
+        if len(bad):
+            self._bad.append(bad)
+
+    def _mismatches(self, key: tuple[int, int], sums: dict[str, np.ndarray]) -> pd.DataFrame:
+        bad = (sums["n_children"] > 0) & ~np.isclose(sums["parent"], sums["children"], rtol=1e-9, atol=1e-6)
+        if not bad.any():
+            return pd.DataFrame()
+        hi, depth = key
+        keys = [name for name in sums if name != "hash" and name not in SUMS]
+        out = pd.DataFrame({name: sums[name][bad] for name in keys})
+        out.insert(0, "level", self.hierarchies[hi][depth])
+        out["parent"], out["children"] = sums["parent"][bad], sums["children"][bad]
+        out["diff"] = out["parent"] - out["children"]
+        return out
+
+    def checked(self) -> int:
+        """Number of (parent, children) groups compared so far."""
+        return self._checked + sum(int((sums["n_children"] > 0).sum()) for sums in self._open.values())
+
+    def violations(self) -> pd.DataFrame:
+        """One row per subtotal that differs from the sum of its children."""
+        out = self._bad + [self._mismatches(key, sums) for key, sums in self._open.items()]
+        out = [bad for bad in out if len(bad)]
+        if not out:
+            return pd.DataFrame(columns=["level", "parent", "children", "diff"])
+        bad = pd.concat(out, ignore_index=True)
+        keys = [c for c in bad.columns if c not in ("level", "parent", "children", "diff")]
+        return bad[["level", *keys, "parent", "children", "diff"]]
@@ -1,10 +1,22 @@
 from __future__ import annotations
+import argparse
+import hashlib
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib import font_manager, colors as mcolors
+from typing import Callable
+from .cache import load_manifest, save_manifest, source_sha256
 from .config import DATA_PROCESSED, OUTPUTS
+from .fonts import font_stamp, resolve_font
+from .lazy import lazy_import
+from .profiling import ProfileOptions, add_profile_arguments, profile_options, profiled, stage
+from .storage import read_tidy
+from .tracing import add_trace_argument, span, trace_to
+
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+mcolors = lazy_import("matplotlib.colors")
 
 
 def _categorical_color_map(categories: list[str], cmap_name: str = "tab10") -> dict[str, str]:
@@ -30,15 +42,6 @@ def _sequential_colors(values: pd.Series, cmap_name: str = "Blues") -> list[str]
     return [mcolors.to_hex(cmap(norm(float(x)))) for x in v]
 
 
-def _pick_font(preferred: list[str]) -> str:
-    """Pick the first installed font from `preferred`; fall back to DejaVu Sans."""
-    installed = {f.name for f in font_manager.fontManager.ttflist}
-    for name in preferred:
-        if name in installed:
-            return name
-    return "DejaVu Sans"
-
-
 def _set_style() -> None:
     """Presentation-friendly style without custom colors."""
     plt.rcParams.update({
@@ -60,8 +63,8 @@ def _set_style() -> None:
     # Make line charts and multi-series plots default to distinct colors.
     plt.rcParams["axes.prop_cycle"] = plt.cycler(color=list(plt.get_cmap("tab10").colors))
 
-    font = _pick_font(["Malgun Gothic", "AppleGothic", "NanumGothic", "Noto Sans CJK KR", "Noto Sans KR"])
-    plt.rcParams["font.family"] = font
+    # Korean-capable font, picked from matplotlib's font list (src.fonts).
+    plt.rcParams["font.family"], _ = resolve_font()
     plt.rcParams["axes.unicode_minus"] = False
 
 
@@ -74,18 +77,22 @@ def _ensure_fig_dir() -> Path:
 def _save(fig, outpath: Path) -> None:
     outpath.parent.mkdir(parents=True, exist_ok=True)
     fig.tight_layout()
-    fig.savefig(outpath, bbox_inches="tight")
+    with span("savefig", file=outpath.name):
+        fig.savefig(outpath, bbox_inches="tight")
     plt.close(fig)
 
 
-def load_processed() -> dict[str, pd.DataFrame]:
-    return {
-        "period_type": pd.read_csv(DATA_PROCESSED / "prosecution_reoffend_period_type_2017_tidy.csv"),
-        "kosis_prior": pd.read_csv(DATA_PROCESSED / "kosis_prior_convictions_2023_tidy.csv"),
-        "edu": pd.read_csv(DATA_PROCESSED / "police_education_2020_tidy.csv"),
-        "world": pd.read_csv(DATA_PROCESSED / "world_recidivism_rates_tidy.csv"),
-        "e_nara": pd.read_csv(DATA_PROCESSED / "e_nara_3yr_reimprisonment_tidy.csv"),
-    }
+TIDY_FILES = {
+    "period_type": "prosecution_reoffend_period_type_2017_tidy.csv",
+    "kosis_prior": "kosis_prior_convictions_2023_tidy.csv",
+    "edu": "police_education_2020_tidy.csv",
+    "world": "world_recidivism_rates_tidy.csv",
+    "e_nara": "e_nara_3yr_reimprisonment_tidy.csv",
+}
+
+
+def load_processed(compact: bool = False, names: list[str] | None = None) -> dict[str, pd.DataFrame]:
+    return {name: read_tidy(DATA_PROCESSED / TIDY_FILES[name], compact=compact) for name in names or TIDY_FILES}
 
 
 
@@ -97,7 +104,7 @@ def fig_domestic_reimprisonment(e_nara: pd.DataFrame, out: Path) -> None:
     df["year"] = df["year"].astype(int)
 
     fig, ax = plt.subplots()
-    for metric, g in df.groupby("metric", sort=False):
+    for metric, g in df.groupby("metric", sort=False, observed=True):
         g = g.sort_values("year")
         ax.plot(g["year"], g["value"], marker="o", label=metric)
 
@@ -116,13 +123,13 @@ def fig_reoffend_time_distribution(period_type: pd.DataFrame, out: Path) -> None
     order = ["1개월이내", "3개월이내", "6개월이내", "1년이내", "2년이내", "3년이내", "3년초과"]
     df = period_type.copy()
 
-    agg = df.groupby(["recid_type", "period"], as_index=False)["count"].sum()
+    agg = df.groupby(["recid_type", "period"], as_index=False, observed=True)["count"].sum()
     agg["period"] = pd.Categorical(agg["period"], categories=order, ordered=True)
     agg = agg.sort_values(["recid_type", "period"])
-    agg["share_pct"] = agg.groupby("recid_type")["count"].transform(lambda s: 100 * s / s.sum())
+    agg["share_pct"] = agg.groupby("recid_type", observed=True)["count"].transform(lambda s: 100 * s / s.sum())
 
     fig, ax = plt.subplots()
-    for recid_type, g in agg.groupby("recid_type", sort=False):
+    for recid_type, g in agg.groupby("recid_type", sort=False, observed=True):
         ax.plot(g["period"].astype(str), g["share_pct"], marker="o", label=recid_type)
 
     ax.set_title("재범까지 경과기간 분포(비중)")
@@ -136,7 +143,7 @@ def fig_reoffend_time_distribution(period_type: pd.DataFrame, out: Path) -> None
 # Figure 3: 재범자 수 상위 범죄유형 (Top-N) - barh
 
 def fig_top_crimes(period_type: pd.DataFrame, out: Path, top_n: int = 12) -> None:
-    total = period_type.groupby("crime", as_index=False)["count"].sum()
+    total = period_type.groupby("crime", as_index=False, observed=True)["count"].sum()
     total = total.sort_values("count", ascending=False).head(top_n).sort_values("count")
 
     fig, ax = plt.subplots(figsize=(9, 6))
@@ -208,7 +215,7 @@ def fig_education_bucket_share(edu: pd.DataFrame, out: Path) -> None:
 
     df = edu.copy()
     df["bucket"] = df["education"].map(bucket)
-    total = df.groupby("bucket", as_index=False)["count"].sum()
+    total = df.groupby("bucket", as_index=False, observed=True)["count"].sum()
     total["share_pct"] = 100 * total["count"] / total["count"].sum()
     total = total.sort_values("share_pct", ascending=False)
 
@@ -240,7 +247,7 @@ def fig_world_followup_lines(world: pd.DataFrame, out: Path) -> None:
     df = df.sort_values(["country", "followup_years", "period"]).drop_duplicates(["country", "followup_years"], keep="last")
 
     fig, ax = plt.subplots(figsize=(9, 5.5))
-    for c, g in df.groupby("country", sort=False):
+    for c, g in df.groupby("country", sort=False, observed=True):
         g = g.sort_values("followup_years")
         ax.plot(g["followup_years"], g["rate_pct"], marker="o", label=c)
 
@@ -252,18 +259,144 @@ def fig_world_followup_lines(world: pd.DataFrame, out: Path) -> None:
     _save(fig, out)
 
 
-def main() -> None:
+# Output file -> (figure function, tidy table key, extra arguments).
+FIGURES: dict[str, tuple[Callable[..., None], str, dict]] = {
+    "01_domestic_3yr_reimprisonment_trend.png": (fig_domestic_reimprisonment, "e_nara", {}),
+    "02_reoffend_time_distribution.png": (fig_reoffend_time_distribution, "period_type", {}),
+    "03_top_crimes_reoffenders.png": (fig_top_crimes, "period_type", {"top_n": 12}),
+    "04_prior_conviction_share_2023.png": (fig_prior_conviction_share, "kosis_prior", {}),
+    "05_education_bucket_share_2020.png": (fig_education_bucket_share, "edu", {}),
+    "06_world_recidivism_followup_lines.png": (fig_world_followup_lines, "world", {}),
+}
+
+
+def render_figure(out_name: str, compact: bool = False, tables: dict[str, pd.DataFrame] | None = None) -> Path:
+    """Render one figure under outputs/figures/, loading only the table it needs."""
+    func, table, kwargs = FIGURES[out_name]
+    if tables is None:
+        _set_style()
+        tables = load_processed(compact=compact, names=[table])
+    out = _ensure_fig_dir() / out_name
+    with span(out_name, cat="figure"), span("draw", func=func.__name__, rows=len(tables[table])):
+        func(tables[table], out, **kwargs)
+    return out
+
+
+# Kept next to the PNGs it describes.
+RENDER_MANIFEST = OUTPUTS / "figures" / "_render.json"
+
+# Output file -> (columns, row filter) of the table its fig_* actually reads, so
+# an edit elsewhere in the table (or in rows a figure filters out) keeps it fresh.
+FIGURE_READS: dict[str, tuple[list[str], Callable[[pd.DataFrame], pd.Series] | None]] = {
+    "01_domestic_3yr_reimprisonment_trend.png": (
+        ["metric", "year", "value"], lambda df: df["metric"].str.contains("재복역기간")),
+    "02_reoffend_time_distribution.png": (["recid_type", "period", "count"], None),
+    "03_top_crimes_reoffenders.png": (["crime", "count"], None),
+    "04_prior_conviction_share_2023.png": (
+        ["group", "detail", "count"],
+        lambda df: (df["crime_lvl1"] == "합계") & (df["crime_lvl2"] == "소계") & (df["crime_lvl3"] == "소계")),
+    "05_education_bucket_share_2020.png": (["education", "count"], None),
+    "06_world_recidivism_followup_lines.png": (
+        ["type", "followup_years", "country", "period", "rate_pct"],
+        lambda df: df["type"].str.lower().eq("reimprisonment")),
+}
+
+
+def _table_sha256(df: pd.DataFrame) -> str:
+    h = hashlib.sha256(repr([(col, str(dtype)) for col, dtype in df.dtypes.items()]).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def style_sha256() -> str:
+    """Hash of what decides the figure style: _set_style's code plus the font
+    stamp (matplotlib version, its font list, matplotlibrc). Imports neither
+    matplotlib nor pyplot; the pipeline keys its figure nodes on it too."""
+    return hashlib.sha256(repr((source_sha256(_set_style), font_stamp())).encode("utf-8")).hexdigest()
+
+
+def _read_subset(df: pd.DataFrame, out_name: str) -> pd.DataFrame:
+    columns, rows = FIGURE_READS[out_name]
+    return (df if rows is None else df[rows(df)])[columns]
+
+
+def render_keys(tables: dict[str, pd.DataFrame]) -> dict[str, dict[str, str]]:
+    """Per figure: hashes of the rows and columns it reads, its fig_* code (with
+    helpers and arguments) and the style. A figure whose key is unchanged needs no redraw."""
+    style = style_sha256()
+    keys = {}
+    for out_name, (func, table, kwargs) in FIGURES.items():
+        data = _table_sha256(_read_subset(tables[table], out_name))
+        code = hashlib.sha256((source_sha256(func) + repr(sorted(kwargs.items()))).encode("utf-8")).hexdigest()
+        keys[out_name] = {"data": data, "code": code, "style": style}
+    return keys
+
+
+# Tables a pool worker renders from, set once by _init_worker.
+_worker_tables: dict[str, pd.DataFrame] = {}
+
+
+def _init_worker(tables: dict[str, pd.DataFrame]) -> None:
+    """Pool initializer: style once per worker and keep the loaded tables.
+
+    Under fork the tables are inherited from the parent's memory; under spawn
+    they are unpickled once per worker. Either way nothing re-parses the tidy files.
+    """
+    global _worker_tables
     _set_style()
-    fig_dir = _ensure_fig_dir()
-    t = load_processed()
+    _worker_tables = tables
+
+
+def _render_timed(out_name: str, profile: ProfileOptions | None = None) -> float:
+    t0 = time.perf_counter()
+    profiled(profile, out_name, render_figure, out_name, False, _worker_tables)
+    return time.perf_counter() - t0
 
-    fig_domestic_reimprisonment(t["e_nara"], fig_dir / "01_domestic_3yr_reimprisonment_trend.png")
-    fig_reoffend_time_distribution(t["period_type"], fig_dir / "02_reoffend_time_distribution.png")
-    fig_top_crimes(t["period_type"], fig_dir / "03_top_crimes_reoffenders.png", top_n=12)
-    fig_prior_conviction_share(t["kosis_prior"], fig_dir / "04_prior_conviction_share_2023.png")
-    fig_education_bucket_share(t["edu"], fig_dir / "05_education_bucket_share_2020.png")
-    fig_world_followup_lines(t["world"], fig_dir / "06_world_recidivism_followup_lines.png")
 
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Render the figures under outputs/figures/.")
+    parser.add_argument("--compact", action="store_true", help="load tidy tables with compact dtypes (categoricals, small uints)")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes rendering figures (1 = serial)")
+    parser.add_argument("--force", action="store_true", help="redraw every figure, ignoring the render cache")
+    add_profile_arguments(parser)
+    add_trace_argument(parser, "visualize")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    fig_dir = _ensure_fig_dir()
+    profile = profile_options(args, "visualize")
+    with trace_to(args.trace, "visualize"):
+        with stage(profile, "load_processed"):
+            t = load_processed(compact=args.compact)
+
+        # Redraw only figures whose data, code or style changed since their last render.
+        manifest = {} if args.force else load_manifest(RENDER_MANIFEST)
+        keys = render_keys(t)
+        stale = [name for name in FIGURES if manifest.get(name) != keys[name] or not (fig_dir / name).exists()]
+        for out_name in FIGURES:
+            if out_name not in stale:
+                print(f"  {out_name}: up to date")
+
+        # Styled (and pyplot imported) before any fork, so forked workers start warm;
+        # skipped entirely when every figure is up to date.
+        if stale:
+            _init_worker(t)
+
+        def done(out_name: str, elapsed: float) -> None:
+            manifest[out_name] = keys[out_name]
+            save_manifest(RENDER_MANIFEST, manifest)
+            print(f"  {out_name}: {elapsed:.2f}s")
+
+        if args.jobs <= 1:
+            for out_name in stale:
+                done(out_name, _render_timed(out_name, profile))
+        elif stale:
+            with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker, initargs=(t,)) as pool:
+                futures = {pool.submit(_render_timed, out_name, profile): out_name for out_name in stale}
+                for fut in as_completed(futures):
+                    done(futures[fut], fut.result())
+
+    print(f"  total: {time.perf_counter() - t0:.2f}s (rendered {len(stale)}, up to date {len(FIGURES) - len(stale)})")
     print(f"[OK] Saved figures to: {fig_dir}")
 
 
@@ -0,0 +1,158 @@
+"""Watch data/raw and rebuild only the outputs downstream of each changed file.
+
+    python -m src.watch [--debounce 2.0] [--jobs N]
+
+Uses Linux inotify (through libc, no extra package) and falls back to polling
+file stamps elsewhere. A burst of writes (an export being copied in, Excel
+saving through temp files) is collected until the directory has been quiet
+for ``--debounce`` seconds, then handled as one rebuild.
+"""
+from __future__ import annotations
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+from .config import DATA_RAW, DATA_PROCESSED
+from .pipeline import build_graph, downstream, run
+from .preprocess import SOURCES
+from .profiling import add_profile_arguments, profile_options
+from .storage import default_format, parse_formats
+
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; the name follows
+
+# Lock files and partial downloads that never become inputs themselves.
+IGNORED = (".*", "~$*", "*.tmp", "*.part", "*.crdownload")
+
+
+class _Inotify:
+    def __init__(self, directory: Path) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+
+    def read(self, timeout: float | None) -> set[str]:
+        """Names changed within ``timeout`` seconds (None = block until something changes)."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        names, pos = set(), 0
+        while pos < len(buf):
+            _, _, _, length = EVENT.unpack_from(buf, pos)
+            pos += EVENT.size
+            names.add(os.fsdecode(buf[pos:pos + length].rstrip(b"\0")))
+            pos += length
+        return names
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _Poller:
+    """Stat-based stand-in where inotify is unavailable."""
+
+    def __init__(self, directory: Path, interval: float = 1.0) -> None:
+        self.directory = directory
+        self.interval = interval
+        self.stamps = self._scan()
+
+    def _scan(self) -> dict[str, tuple[float, int]]:
+        return {p.name: (p.stat().st_mtime, p.stat().st_size) for p in self.directory.iterdir() if p.is_file()}
+
+    def read(self, timeout: float | None) -> set[str]:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        old, self.stamps = self.stamps, self._scan()
+        return {name for name in old.keys() | self.stamps.keys() if old.get(name) != self.stamps.get(name)}
+
+    def close(self) -> None:
+        pass
+
+
+def _open_watcher(directory: Path):
+    try:
+        return _Inotify(directory)
+    except (OSError, AttributeError, TypeError):  # not Linux, or no inotify in libc
+        print("  inotify unavailable, polling instead")
+        return _Poller(directory)
+
+
+def _is_input(name: str) -> bool:
+    return not any(fnmatch(name, pat) for pat in IGNORED) and any(fnmatch(name, s.pattern) for s in SOURCES)
+
+
+def collect(watcher, debounce: float) -> set[str]:
+    """Block for the next change, then keep collecting until ``debounce`` seconds pass quietly."""
+    changed = set()
+    while not changed:
+        changed = {n for n in watcher.read(None) if _is_input(n)}
+    while True:
+        more = watcher.read(debounce)
+        if not more:
+            return changed
+        changed |= {n for n in more if _is_input(n)}
+
+
+def rebuild(changed: set[str], args: argparse.Namespace) -> None:
+    """Rebuild the tidy tables fed by ``changed`` raw files and everything below them."""
+    t0 = time.perf_counter()
+    nodes = build_graph(args.format, args.mem_budget_mb, args.compact)
+    roots = {f"{Path(name).stem}_tidy.csv" for name in changed if (DATA_RAW / name).exists()}
+    for name in sorted(changed):
+        print(f"  {name}: {'changed' if f'{Path(name).stem}_tidy.csv' in roots else 'removed (outputs kept)'}")
+    sub = downstream(nodes, roots & nodes.keys())
+    if not sub:
+        return
+    status = run(sub, jobs=args.jobs, profile=profile_options(args, "watch"))
+    ran = sum(s == "ran" for s in status.values())
+    print(f"  rebuilt {ran} of {len(nodes)} outputs in {time.perf_counter() - t0:.2f}s")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Watch data/raw and rebuild the outputs affected by each change.")
+    parser.add_argument("--debounce", type=float, default=2.0, help="quiet seconds that end a burst of writes")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes for independent nodes (1 = serial)")
+    parser.add_argument("--format", default=default_format(), help="tidy table formats, as in src.preprocess")
+    parser.add_argument("--mem-budget-mb", type=float, default=None, help="stream CSV sources, as in src.preprocess")
+    parser.add_argument("--compact", action="store_true", help="load tidy tables with compact dtypes")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        parse_formats(args.format)
+    except (ValueError, RuntimeError) as e:
+        parser.error(str(e))
+
+    DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
+    watcher = _open_watcher(DATA_RAW)
+    try:
+        # Start from an up-to-date tree so each later event only touches its own outputs.
+        run(build_graph(args.format, args.mem_budget_mb, args.compact), jobs=args.jobs,
+            profile=profile_options(args, "watch"))
+        print(f"👀 watching {DATA_RAW} (Ctrl+C to stop)")
+        while True:
+            rebuild(collect(watcher, args.debounce), args)
+    except KeyboardInterrupt:
+        print("\n  stopped")
+    finally:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    main()